@@ -11,8 +11,10 @@ from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from backend.routes import session, conversation, agent
-from backend.utils.database import init_db
+from backend.routes import session, conversation, agent, stats
+from backend.utils.database import init_db, dispose_engines
+from backend.utils.http_client import get_http_client, close_http_client
+from backend.services import agent_service
 from backend.utils.config import config
 
 # Enable tracemalloc to get object allocation traceback
@@ -38,10 +40,21 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {str(e)}")
         # Still allow the application to start, but log the error
     
+    # Open the shared HTTP client for remote agents
+    get_http_client()
+    
+    # Start probing remote agents
+    await agent_service.start_health_monitor()
+    
     yield  # This is where the application runs
     
     # Shutdown logic
     logger.info("Shutting down Deepdevflow backend application")
+    await agent_service.stop_health_monitor()
+    await agent_service.stop_task_poller()
+    await agent_service.stop_session_service()
+    await close_http_client()
+    await dispose_engines()
 
 
 # Create FastAPI application with lifespan
@@ -67,6 +80,7 @@ app.add_middleware(
 app.include_router(session.router)
 app.include_router(conversation.router)
 app.include_router(agent.router)
+app.include_router(stats.router)
 
 
 @app.get("/", tags=["Root"])
@@ -6,6 +6,7 @@ from .conversation import Conversation
 from .message import Message
 from .agent import Agent
 from .task import Task, TaskState
+from .agent_session import AgentSession, AgentSessionEvent
 
 __all__ = [
     "Base",
@@ -16,4 +17,6 @@ __all__ = [
     "Agent", 
     "Task",
     "TaskState",
+    "AgentSession",
+    "AgentSessionEvent",
 ]
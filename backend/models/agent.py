@@ -3,7 +3,7 @@
 from typing import Any, Dict, List, Optional
 import json
 
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -13,6 +13,9 @@ class Agent(BaseModel):
     """Agent model to store registered agents."""
 
     __tablename__ = "agents"
+    __table_args__ = (
+        Index("ix_agents_is_active_is_remote", "is_active", "is_remote"),
+    )
 
     name = Column(String(255), nullable=False, unique=True)
     description = Column(Text, nullable=True)
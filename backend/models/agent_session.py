@@ -0,0 +1,64 @@
+"""Agent session models for the Deepdevflow framework."""
+
+from typing import Any, Dict
+import json
+
+from sqlalchemy import Column, String, Text, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from .base import BaseModel
+
+
+class AgentSession(BaseModel):
+    """Agent session model to store ADK session state."""
+    
+    __tablename__ = "agent_sessions"
+    __table_args__ = (
+        Index("ix_agent_sessions_app_name_user_id", "app_name", "user_id"),
+    )
+    
+    app_name = Column(String(255), nullable=False)
+    user_id = Column(String(255), nullable=False)
+    state = Column(Text, nullable=True)  # JSON serialized session state
+    last_update_time = Column(Float, nullable=False)  # Timestamp of the last event
+    
+    # Relationships (events are loaded explicitly, ordered by timestamp)
+    events = relationship("AgentSessionEvent", back_populates="session",
+                          cascade="all, delete-orphan", lazy="raise")
+    
+    def __repr__(self) -> str:
+        """String representation of the agent session."""
+        return f"<AgentSession(id={self.id}, app_name={self.app_name}, user_id={self.user_id})>"
+    
+    @property
+    def state_json(self) -> Dict[str, Any]:
+        """Get state as JSON."""
+        if not self.state:
+            return {}
+        return json.loads(self.state)
+    
+    @state_json.setter
+    def state_json(self, value: Dict[str, Any]) -> None:
+        """Set state from JSON."""
+        self.state = json.dumps(value) if value else None
+
+
+class AgentSessionEvent(BaseModel):
+    """Agent session event model to store ADK session events."""
+    
+    __tablename__ = "agent_session_events"
+    __table_args__ = (
+        # Events are always replayed per session in timestamp order
+        Index("ix_agent_session_events_session_id_timestamp", "session_id", "timestamp"),
+    )
+    
+    session_id = Column(String(36), ForeignKey("agent_sessions.id", ondelete="CASCADE"), nullable=False)
+    timestamp = Column(Float, nullable=False)
+    event_data = Column(Text, nullable=False)  # JSON serialized ADK event
+    
+    # Relationships
+    session = relationship("AgentSession", back_populates="events")
+    
+    def __repr__(self) -> str:
+        """String representation of the agent session event."""
+        return f"<AgentSessionEvent(id={self.id}, session_id={self.session_id})>"
@@ -1,7 +1,7 @@
 """Conversation model for the Deepdevflow framework."""
 
 from typing import List, Optional
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey
+from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -11,16 +11,20 @@ class Conversation(BaseModel):
     """Conversation model to store chat conversations."""
 
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_session_id_is_active", "session_id", "is_active"),
+        Index("ix_conversations_is_active_created_at", "is_active", "created_at"),
+    )
 
     name = Column(String(255), nullable=False, default="New Conversation")
     session_id = Column(String(36), ForeignKey("sessions.id"), nullable=False)
     is_active = Column(Boolean, default=True)
     conversation_metadata = Column(Text, nullable=True)  # Changed from 'metadata' which is reserved
     
-    # Relationships
+    # Relationships (loaded explicitly with selectinload; lazy loads raise)
     session = relationship("Session", back_populates="conversations")
     messages = relationship("Message", back_populates="conversation", 
-                           cascade="all, delete-orphan")
+                           cascade="all, delete-orphan", lazy="raise")
 
     def __repr__(self) -> str:
         """String representation of the conversation."""
@@ -3,7 +3,7 @@
 from typing import Any, Dict, List, Optional
 import json
 
-from sqlalchemy import Column, String, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -13,6 +13,10 @@ class Message(BaseModel):
     """Message model to store chat messages."""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # Message history is always fetched per conversation in creation order
+        Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
 
     conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=False)
     role = Column(String(50), nullable=False)  # 'user', 'agent', 'system', etc.
@@ -1,7 +1,7 @@
 """Session model for the Deepdevflow framework."""
 
 from typing import List, Optional
-from sqlalchemy import Column, String, Boolean, Text, Integer
+from sqlalchemy import Column, String, Boolean, Text, Integer, Index
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -11,6 +11,9 @@ class Session(BaseModel):
     """Session model to store user sessions."""
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_is_active_created_at", "is_active", "created_at"),
+    )
 
     name = Column(String(255), nullable=False, default="New Session")
     user_id = Column(String(255), nullable=True)  # Can be null for anonymous sessions
@@ -18,9 +21,9 @@ class Session(BaseModel):
     session_metadata = Column(Text, nullable=True)  # JSON serialized metadata, renamed from 'metadata' which is reserved
     expiry_days = Column(Integer, default=30)
     
-    # Relationships
+    # Relationships (loaded explicitly with selectinload; lazy loads raise)
     conversations = relationship("Conversation", back_populates="session", 
-                                cascade="all, delete-orphan")
+                                cascade="all, delete-orphan", lazy="raise")
 
     def __repr__(self) -> str:
         """String representation of the session."""
@@ -4,7 +4,7 @@ from typing import Any, Dict, List, Optional
 import json
 import enum
 
-from sqlalchemy import Column, String, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, Text, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -26,6 +26,11 @@ class Task(BaseModel):
     """Task model to store agent tasks."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_session_id_state", "session_id", "state"),
+        Index("ix_tasks_agent_id_state", "agent_id", "state"),
+        Index("ix_tasks_message_id", "message_id"),
+    )
 
     agent_id = Column(String(36), ForeignKey("agents.id"), nullable=False)
     message_id = Column(String(36), ForeignKey("messages.id"), nullable=False)
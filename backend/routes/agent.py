@@ -1,14 +1,16 @@
 """Agent routes for Deepdevflow."""
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
 
 from backend.models import Agent as AgentModel
-from backend.utils.database import get_session
+from backend.utils.database import get_async_session
 from backend.services import agent_service
-from .schemas import AgentCreate, AgentResponse
+from .schemas import AgentCreate, AgentResponse, AgentPage
+from .pagination import MAX_PAGE_SIZE, paginate
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
@@ -16,7 +18,7 @@ router = APIRouter(prefix="/agents", tags=["agents"])
 @router.post("/", response_model=AgentResponse, status_code=status.HTTP_201_CREATED)
 async def create_agent(
     agent_data: AgentCreate,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Create a new agent.
     
@@ -43,8 +45,8 @@ async def create_agent(
     
     # Add to database
     db.add(new_agent)
-    db.commit()
-    db.refresh(new_agent)
+    await db.commit()
+    await db.refresh(new_agent)
     
     # Register with agent service
     if agent_data.is_remote:
@@ -53,8 +55,8 @@ async def create_agent(
         if not success:
             # Mark as inactive if registration failed
             new_agent.is_active = False
-            db.commit()
-            db.refresh(new_agent)
+            await db.commit()
+            await db.refresh(new_agent)
             
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,47 +66,47 @@ async def create_agent(
     return new_agent
 
 
-@router.get("/", response_model=List[AgentResponse])
+@router.get("/", response_model=AgentPage)
 async def list_agents(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     active_only: bool = True,
     remote_only: Optional[bool] = None,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """List agents.
     
     Args:
-        skip: The number of agents to skip.
+        cursor: The cursor returned by the previous page, if any.
         limit: The maximum number of agents to return.
         active_only: Whether to return only active agents.
         remote_only: Whether to return only remote agents.
         db: The database session.
         
     Returns:
-        A list of agents.
+        A page of agents with the cursor for the next page.
     """
     # Query agents
-    query = db.query(AgentModel)
+    query = select(AgentModel)
     
     # Filter active agents if requested
     if active_only:
-        query = query.filter(AgentModel.is_active == True)
+        query = query.where(AgentModel.is_active == True)
     
     # Filter remote agents if requested
     if remote_only is not None:
-        query = query.filter(AgentModel.is_remote == remote_only)
+        query = query.where(AgentModel.is_remote == remote_only)
     
     # Apply pagination
-    agents = query.offset(skip).limit(limit).all()
+    agents, next_cursor = await paginate(db, query, AgentModel, limit, cursor)
     
-    return agents
+    return AgentPage(items=agents, next_cursor=next_cursor)
 
 
 @router.get("/{agent_id}", response_model=AgentResponse)
 async def get_agent(
     agent_id: str,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Get an agent by ID.
     
@@ -116,7 +118,7 @@ async def get_agent(
         The agent.
     """
     # Get agent
-    agent = db.query(AgentModel).filter(AgentModel.id == agent_id).first()
+    agent = await db.get(AgentModel, agent_id)
     
     # Raise exception if not found
     if not agent:
@@ -132,7 +134,7 @@ async def get_agent(
 async def update_agent(
     agent_id: str,
     agent_data: AgentCreate,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Update an agent.
     
@@ -145,7 +147,7 @@ async def update_agent(
         The updated agent.
     """
     # Get agent
-    agent = db.query(AgentModel).filter(AgentModel.id == agent_id).first()
+    agent = await db.get(AgentModel, agent_id)
     
     # Raise exception if not found
     if not agent:
@@ -170,8 +172,8 @@ async def update_agent(
     agent.agent_metadata = json.dumps(agent_data.metadata) if agent_data.metadata else None  # Changed from metadata to agent_metadata
     
     # Commit changes
-    db.commit()
-    db.refresh(agent)
+    await db.commit()
+    await db.refresh(agent)
     
     # Register with agent service if now remote
     if agent.is_remote and (not was_remote or agent.is_active):
@@ -180,8 +182,8 @@ async def update_agent(
         if not success:
             # Mark as inactive if registration failed
             agent.is_active = False
-            db.commit()
-            db.refresh(agent)
+            await db.commit()
+            await db.refresh(agent)
             
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -194,7 +196,7 @@ async def update_agent(
 @router.delete("/{agent_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_agent(
     agent_id: str,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Delete an agent.
     
@@ -203,7 +205,7 @@ async def delete_agent(
         db: The database session.
     """
     # Get agent
-    agent = db.query(AgentModel).filter(AgentModel.id == agent_id).first()
+    agent = await db.get(AgentModel, agent_id)
     
     # Raise exception if not found
     if not agent:
@@ -216,7 +218,7 @@ async def delete_agent(
     agent.is_active = False
     
     # Commit changes
-    db.commit()
+    await db.commit()
     
     # Unregister from agent service
     if agent.is_remote:
@@ -226,7 +228,7 @@ async def delete_agent(
 @router.post("/{agent_id}/register", response_model=AgentResponse)
 async def register_agent(
     agent_id: str,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Register an agent with the agent service.
     
@@ -238,7 +240,7 @@ async def register_agent(
         The registered agent.
     """
     # Get agent
-    agent = db.query(AgentModel).filter(AgentModel.id == agent_id).first()
+    agent = await db.get(AgentModel, agent_id)
     
     # Raise exception if not found
     if not agent:
@@ -267,8 +269,8 @@ async def register_agent(
     agent.is_active = True
     
     # Commit changes
-    db.commit()
-    db.refresh(agent)
+    await db.commit()
+    await db.refresh(agent)
     
     return agent
 
@@ -276,7 +278,7 @@ async def register_agent(
 @router.post("/{agent_id}/unregister", status_code=status.HTTP_204_NO_CONTENT)
 async def unregister_agent(
     agent_id: str,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Unregister an agent from the agent service.
     
@@ -285,7 +287,7 @@ async def unregister_agent(
         db: The database session.
     """
     # Get agent
-    agent = db.query(AgentModel).filter(AgentModel.id == agent_id).first()
+    agent = await db.get(AgentModel, agent_id)
     
     # Raise exception if not found
     if not agent:
@@ -314,4 +316,4 @@ async def unregister_agent(
     agent.is_active = False
     
     # Commit changes
-    db.commit()
+    await db.commit()
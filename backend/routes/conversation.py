@@ -1,9 +1,13 @@
 """Conversation routes for Deepdevflow."""
 
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Optional
+import logging
 import sqlalchemy.orm
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi.responses import StreamingResponse as StreamingHTTPResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
 
 from backend.models import (
@@ -11,23 +15,35 @@ from backend.models import (
     Message as MessageModel,
     Session as SessionModel
 )
-from backend.utils.database import get_session
+from backend.utils.database import get_async_session, get_async_session_factory
 from backend.services import agent_service
 from .schemas import (
     ConversationCreate, 
     ConversationResponse, 
+    ConversationPage,
     MessageCreate,
     MessageResponse,
+    MessagePage,
     StreamingResponse
 )
+from .pagination import MAX_PAGE_SIZE, after_position, paginate
+
+# Setup logging
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
+# Media types for the supported chat stream formats
+STREAM_MEDIA_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
 
 @router.post("/", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
 async def create_conversation(
     conversation_data: ConversationCreate,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Create a new conversation.
     
@@ -39,9 +55,7 @@ async def create_conversation(
         The created conversation.
     """
     # Check if session exists
-    session = db.query(SessionModel).filter(
-        SessionModel.id == conversation_data.session_id
-    ).first()
+    session = await db.get(SessionModel, conversation_data.session_id)
     
     # Raise exception if session not found
     if not session:
@@ -60,54 +74,56 @@ async def create_conversation(
     
     # Add to database
     db.add(new_conversation)
-    db.commit()
-    db.refresh(new_conversation)
+    await db.commit()
+    await db.refresh(new_conversation)
     
     return new_conversation
 
 
-@router.get("/", response_model=List[ConversationResponse])
+@router.get("/", response_model=ConversationPage)
 async def list_conversations(
     session_id: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     active_only: bool = True,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """List conversations.
     
     Args:
         session_id: Optional session ID to filter by.
-        skip: The number of conversations to skip.
+        cursor: The cursor returned by the previous page, if any.
         limit: The maximum number of conversations to return.
         active_only: Whether to return only active conversations.
         db: The database session.
         
     Returns:
-        A list of conversations.
+        A page of conversations with the cursor for the next page.
     """
     # Query conversations
-    query = db.query(ConversationModel)
+    query = select(ConversationModel)
     
     # Filter by session ID if provided
     if session_id:
-        query = query.filter(ConversationModel.session_id == session_id)
+        query = query.where(ConversationModel.session_id == session_id)
     
     # Filter active conversations if requested
     if active_only:
-        query = query.filter(ConversationModel.is_active == True)
+        query = query.where(ConversationModel.is_active == True)
     
     # Apply pagination
-    conversations = query.offset(skip).limit(limit).all()
+    conversations, next_cursor = await paginate(
+        db, query, ConversationModel, limit, cursor
+    )
     
-    return conversations
+    return ConversationPage(items=conversations, next_cursor=next_cursor)
 
 
 @router.get("/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
     conversation_id: str,
     include_messages: bool = False,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Get a conversation by ID.
     
@@ -120,18 +136,19 @@ async def get_conversation(
         The conversation.
     """
     # Query conversation
-    query = db.query(ConversationModel).filter(
+    query = select(ConversationModel).where(
         ConversationModel.id == conversation_id
     )
     
     # Include messages if requested
     if include_messages:
         query = query.options(
-            sqlalchemy.orm.joinedload(ConversationModel.messages)
+            sqlalchemy.orm.selectinload(ConversationModel.messages)
         )
     
     # Get conversation
-    conversation = query.first()
+    result = await db.execute(query)
+    conversation = result.scalars().first()
     
     # Raise exception if not found
     if not conversation:
@@ -147,7 +164,7 @@ async def get_conversation(
 async def update_conversation(
     conversation_id: str,
     conversation_data: ConversationCreate,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Update a conversation.
     
@@ -160,9 +177,7 @@ async def update_conversation(
         The updated conversation.
     """
     # Get conversation
-    conversation = db.query(ConversationModel).filter(
-        ConversationModel.id == conversation_id
-    ).first()
+    conversation = await db.get(ConversationModel, conversation_id)
     
     # Raise exception if not found
     if not conversation:
@@ -172,9 +187,7 @@ async def update_conversation(
         )
     
     # Check if session exists
-    session = db.query(SessionModel).filter(
-        SessionModel.id == conversation_data.session_id
-    ).first()
+    session = await db.get(SessionModel, conversation_data.session_id)
     
     # Raise exception if session not found
     if not session:
@@ -190,8 +203,8 @@ async def update_conversation(
     conversation.conversation_metadata = json.dumps(conversation_data.metadata) if conversation_data.metadata else None  # Changed from metadata to conversation_metadata
     
     # Commit changes
-    db.commit()
-    db.refresh(conversation)
+    await db.commit()
+    await db.refresh(conversation)
     
     return conversation
 
@@ -199,7 +212,7 @@ async def update_conversation(
 @router.delete("/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_conversation(
     conversation_id: str,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Delete a conversation.
     
@@ -208,9 +221,7 @@ async def delete_conversation(
         db: The database session.
     """
     # Get conversation
-    conversation = db.query(ConversationModel).filter(
-        ConversationModel.id == conversation_id
-    ).first()
+    conversation = await db.get(ConversationModel, conversation_id)
     
     # Raise exception if not found
     if not conversation:
@@ -223,31 +234,31 @@ async def delete_conversation(
     conversation.is_active = False
     
     # Commit changes
-    db.commit()
+    await db.commit()
 
 
-@router.get("/{conversation_id}/messages", response_model=List[MessageResponse])
+@router.get("/{conversation_id}/messages", response_model=MessagePage)
 async def list_conversation_messages(
     conversation_id: str,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_session)
+    after: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
 ):
     """List messages for a conversation.
     
     Args:
         conversation_id: The ID of the conversation to list messages for.
-        skip: The number of messages to skip.
+        after: Optional message ID or ISO timestamp; only newer messages are returned.
+        cursor: The cursor returned by the previous page, if any.
         limit: The maximum number of messages to return.
         db: The database session.
         
     Returns:
-        A list of messages.
+        A page of messages, oldest first, with the cursor for the next page.
     """
     # Check if conversation exists
-    conversation = db.query(ConversationModel).filter(
-        ConversationModel.id == conversation_id
-    ).first()
+    conversation = await db.get(ConversationModel, conversation_id)
     
     # Raise exception if not found
     if not conversation:
@@ -256,14 +267,49 @@ async def list_conversation_messages(
             detail=f"Conversation with ID {conversation_id} not found"
         )
     
-    # Query messages
-    messages = db.query(MessageModel).filter(
+    # Query messages in creation order
+    query = select(MessageModel).where(
         MessageModel.conversation_id == conversation_id
-    ).order_by(
-        MessageModel.created_at.asc()
-    ).offset(skip).limit(limit).all()
+    )
+    
+    # Only return messages newer than the given message or timestamp
+    if after:
+        anchor = await db.get(MessageModel, after)
+        
+        if anchor and anchor.conversation_id == conversation_id:
+            query = query.where(
+                after_position(MessageModel, anchor.created_at, anchor.id)
+            )
+        else:
+            query = query.where(MessageModel.created_at > parse_after_timestamp(after))
+    
+    messages, next_cursor = await paginate(db, query, MessageModel, limit, cursor)
+    
+    return MessagePage(items=messages, next_cursor=next_cursor)
+
+
+def parse_after_timestamp(value: str) -> datetime:
+    """Parse the ``after`` query parameter as a timestamp.
+    
+    Args:
+        value: An ISO 8601 timestamp, with or without timezone.
+        
+    Returns:
+        A naive UTC datetime comparable with stored timestamps.
+    """
+    try:
+        timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'after' must be a message ID in this conversation or an ISO timestamp"
+        )
+    
+    # Stored timestamps are naive UTC
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
     
-    return messages
+    return timestamp
 
 
 @router.post("/{conversation_id}/messages", response_model=MessageResponse)
@@ -271,7 +317,7 @@ async def create_message(
     conversation_id: str,
     message_data: MessageCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Create a new message.
     
@@ -285,9 +331,7 @@ async def create_message(
         The created message.
     """
     # Check if conversation exists
-    conversation = db.query(ConversationModel).filter(
-        ConversationModel.id == conversation_id
-    ).first()
+    conversation = await db.get(ConversationModel, conversation_id)
     
     # Raise exception if not found
     if not conversation:
@@ -307,43 +351,52 @@ async def create_message(
     
     # Add to database
     db.add(new_message)
-    db.commit()
-    db.refresh(new_message)
+    await db.commit()
+    await db.refresh(new_message)
     
     # If the message is from a user, process it in the background to generate a response
     if message_data.role == "user":
         background_tasks.add_task(
             process_user_message,
             conversation_id=conversation_id,
-            message_id=new_message.id,
-            db=db
+            message_id=new_message.id
         )
     
     return new_message
 
 
-@router.post("/{conversation_id}/chat", response_model=List[StreamingResponse])
+@router.post("/{conversation_id}/chat")
 async def chat(
     conversation_id: str,
     message_data: MessageCreate,
-    db: Session = Depends(get_session)
+    stream_format: str = "ndjson",
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Chat with the Deepdevflow system.
     
     This creates a user message and immediately returns a streaming response.
+    Each chunk is flushed to the client as soon as the agent produces it,
+    followed by a final frame with ``done`` set and the ID of the stored
+    response message.
     
     Args:
         conversation_id: The ID of the conversation to chat in.
         message_data: The message data.
+        stream_format: Wire format of the stream, either "ndjson" or "sse".
         db: The database session.
         
     Returns:
         A streaming response from the system.
     """
+    # Validate stream format before touching the database
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported stream format: {stream_format}"
+        )
+    
     # Check if conversation exists
-    conversation = db.query(ConversationModel).filter(
-        ConversationModel.id == conversation_id
-    ).first()
+    conversation = await db.get(ConversationModel, conversation_id)
     
     # Raise exception if not found
     if not conversation:
@@ -363,25 +416,53 @@ async def chat(
     
     # Add to database
     db.add(new_message)
-    db.commit()
-    db.refresh(new_message)
+    await db.commit()
+    await db.refresh(new_message)
     
     # Process message and stream response
-    return process_message_streaming(new_message, db)
+    return StreamingHTTPResponse(
+        encode_stream(process_message_streaming(new_message), stream_format),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={
+            # Disable caching and proxy buffering so chunks reach the client immediately
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+async def encode_stream(chunks, stream_format: str):
+    """Encode streaming chunks into the requested wire format.
+    
+    Args:
+        chunks: Async iterator of StreamingResponse objects.
+        stream_format: Wire format, either "ndjson" or "sse".
+        
+    Yields:
+        Encoded frames ready to be written to the response body.
+    """
+    async for chunk in chunks:
+        payload = chunk.model_dump_json()
+        if stream_format == "sse":
+            event = "done" if chunk.done else "chunk"
+            yield f"event: {event}\ndata: {payload}\n\n"
+        else:
+            yield f"{payload}\n"
 
 
-async def process_user_message(conversation_id: str, message_id: str, db: Session):
+async def process_user_message(conversation_id: str, message_id: str):
     """Process a user message in the background.
     
+    The request's database session is closed by the time background tasks
+    run, so this opens its own session.
+    
     Args:
         conversation_id: The ID of the conversation.
         message_id: The ID of the message to process.
-        db: The database session.
     """
     # Get message
-    message = db.query(MessageModel).filter(
-        MessageModel.id == message_id
-    ).first()
+    async with get_async_session_factory()() as db:
+        message = await db.get(MessageModel, message_id)
     
     if not message:
         return
@@ -401,16 +482,19 @@ async def process_user_message(conversation_id: str, message_id: str, db: Sessio
     )
     
     # Add to database
-    db.add(response_message)
-    db.commit()
+    async with get_async_session_factory()() as db:
+        db.add(response_message)
+        await db.commit()
 
 
-async def process_message_streaming(message: MessageModel, db: Session):
+async def process_message_streaming(message: MessageModel):
     """Process a message and stream the response.
     
+    A dedicated database session is opened only to store the final response,
+    so no connection is held while the agent is generating.
+    
     Args:
         message: The message to process.
-        db: The database session.
         
     Yields:
         StreamingResponse objects with chunks of the response.
@@ -419,15 +503,32 @@ async def process_message_streaming(message: MessageModel, db: Session):
     all_chunks = []
     
     # Process message with agent service
-    async for chunk in agent_service.process_message(message):
-        all_chunks.append(chunk)
+    try:
+        async for chunk in agent_service.process_message(message):
+            if not chunk:
+                continue
+            
+            all_chunks.append(chunk)
+            
+            # Yield chunk
+            yield StreamingResponse(
+                chunk=chunk,
+                done=False,
+                metadata={"message_id": message.id}
+            )
+    except Exception as e:
+        logger.error(f"Error streaming response for message {message.id}: {e}")
         
-        # Yield chunk
+        # Terminate the stream with an error frame; nothing is persisted
         yield StreamingResponse(
-            chunk=chunk,
-            done=False,
-            metadata={"message_id": message.id}
+            chunk="",
+            done=True,
+            metadata={
+                "message_id": message.id,
+                "error": str(e)
+            }
         )
+        return
     
     # Create response message with all chunks
     response_message = MessageModel(
@@ -439,9 +540,10 @@ async def process_message_streaming(message: MessageModel, db: Session):
     )
     
     # Add to database
-    db.add(response_message)
-    db.commit()
-    db.refresh(response_message)
+    async with get_async_session_factory()() as db:
+        db.add(response_message)
+        await db.commit()
+        await db.refresh(response_message)
     
     # Yield final chunk with message ID
     yield StreamingResponse(
@@ -0,0 +1,109 @@
+"""Keyset (cursor) pagination helpers for Deepdevflow routes."""
+
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# Largest page a list route may request
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Encode a row position into an opaque cursor.
+    
+    Args:
+        created_at: Creation timestamp of the last returned row.
+        row_id: ID of the last returned row.
+    
+    Returns:
+        The opaque cursor string.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode an opaque cursor into a row position.
+    
+    Args:
+        cursor: The cursor returned by a previous page.
+    
+    Returns:
+        A tuple of (created_at, row_id).
+    
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def after_position(model: Any, created_at: datetime, row_id: str):
+    """Build a condition selecting rows ordered after a (created_at, id) position.
+    
+    Args:
+        model: The model class being selected.
+        created_at: Creation timestamp of the reference row.
+        row_id: ID of the reference row.
+        
+    Returns:
+        A SQL expression usable in a where clause.
+    """
+    return or_(
+        model.created_at > created_at,
+        and_(model.created_at == created_at, model.id > row_id)
+    )
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of a query ordered by (created_at, id).
+    
+    Rows after the cursor position are located with a range condition on
+    the ordering columns, so the cost of a page does not grow with its depth.
+    
+    Args:
+        db: The database session.
+        query: The filtered select statement to paginate.
+        model: The model class being selected.
+        limit: The maximum number of rows to return.
+        cursor: The cursor returned by the previous page, if any.
+    
+    Returns:
+        A tuple of (rows, next_cursor); next_cursor is None on the last page.
+    """
+    query = query.order_by(model.created_at.asc(), model.id.asc())
+    
+    # Continue after the last row of the previous page
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(after_position(model, created_at, row_id))
+    
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.scalars().all())
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if rows:
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return rows, next_cursor
@@ -1,12 +1,42 @@
 """API schemas for Deepdevflow routes."""
 
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy import inspect as sqlalchemy_inspect
 from enum import Enum
 from datetime import datetime
 import uuid
 
 
+class _LoadedAttributes:
+    """Attribute view of a model that reads relationships a route did not load as None.
+    
+    Relationships are declared with lazy="raise", so any other access to a
+    collection that was not loaded with selectinload fails loudly.
+    """
+    
+    def __init__(self, obj: Any, unloaded: set):
+        self._obj = obj
+        self._unloaded = unloaded
+    
+    def __getattr__(self, name: str) -> Any:
+        if name in self._unloaded:
+            return None
+        return getattr(self._obj, name)
+
+
+def _skip_unloaded(data: Any) -> Any:
+    """Wrap a model so its unloaded relationships serialize as None."""
+    state = sqlalchemy_inspect(data, raiseerr=False)
+    if state is None or not hasattr(state, "unloaded"):
+        return data
+    unloaded = {
+        name for name, relationship in state.mapper.relationships.items()
+        if relationship.lazy == "raise" and name in state.unloaded
+    }
+    return _LoadedAttributes(data, unloaded) if unloaded else data
+
+
 class TaskStateEnum(str, Enum):
     """Task state enumeration."""
     
@@ -83,6 +113,12 @@ class ConversationResponse(ConversationBase):
         description="Messages in the conversation"
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def _skip_unloaded_relationships(cls, data: Any) -> Any:
+        """Read relationships that were not loaded as None."""
+        return _skip_unloaded(data)
+    
     class Config:
         """Pydantic configuration."""
         
@@ -127,6 +163,12 @@ class SessionResponse(SessionBase):
         description="Conversations in the session"
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def _skip_unloaded_relationships(cls, data: Any) -> Any:
+        """Read relationships that were not loaded as None."""
+        return _skip_unloaded(data)
+    
     class Config:
         """Pydantic configuration."""
         
@@ -224,3 +266,64 @@ class StreamingResponse(BaseModel):
         default=None,
         description="Additional metadata for the chunk"
     )
+
+
+class MessagePage(BaseModel):
+    """Schema for a page of messages."""
+    
+    items: List[MessageResponse] = Field(description="Messages in this page")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page, or None if this is the last page"
+    )
+
+
+class ConversationPage(BaseModel):
+    """Schema for a page of conversations."""
+    
+    items: List[ConversationResponse] = Field(description="Conversations in this page")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page, or None if this is the last page"
+    )
+
+
+class SessionPage(BaseModel):
+    """Schema for a page of sessions."""
+    
+    items: List[SessionResponse] = Field(description="Sessions in this page")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page, or None if this is the last page"
+    )
+
+
+class AgentPage(BaseModel):
+    """Schema for a page of agents."""
+    
+    items: List[AgentResponse] = Field(description="Agents in this page")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page, or None if this is the last page"
+    )
+
+
+class CountStats(BaseModel):
+    """Schema for total/active counts of an entity."""
+    
+    total: int = Field(default=0, description="Total number of rows")
+    active: int = Field(default=0, description="Number of active rows")
+
+
+class StatsResponse(BaseModel):
+    """Schema for aggregated system statistics."""
+    
+    sessions: CountStats = Field(description="Session counts")
+    conversations: CountStats = Field(description="Conversation counts")
+    agents: CountStats = Field(description="Agent counts")
+    messages: int = Field(description="Total number of messages")
+    tasks: int = Field(description="Total number of tasks")
+    tasks_by_state: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Number of tasks per task state"
+    )
@@ -1,13 +1,15 @@
 """Session routes for Deepdevflow."""
 
-from typing import List, Optional
+from typing import Optional
 import sqlalchemy.orm
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models import Session as SessionModel, Conversation as ConversationModel
-from backend.utils.database import get_session
-from .schemas import SessionCreate, SessionResponse, ConversationResponse
+from backend.utils.database import get_async_session
+from .schemas import SessionCreate, SessionResponse, SessionPage, ConversationPage
+from .pagination import MAX_PAGE_SIZE, paginate
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
@@ -15,7 +17,7 @@ router = APIRouter(prefix="/sessions", tags=["sessions"])
 @router.post("/", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
 async def create_session(
     session_data: SessionCreate,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Create a new session.
     
@@ -37,48 +39,50 @@ async def create_session(
     
     # Add to database
     db.add(new_session)
-    db.commit()
-    db.refresh(new_session)
+    await db.commit()
+    await db.refresh(new_session)
     
     return new_session
 
 
-@router.get("/", response_model=List[SessionResponse])
+@router.get("/", response_model=SessionPage)
 async def list_sessions(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     active_only: bool = True,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """List sessions.
     
     Args:
-        skip: The number of sessions to skip.
+        cursor: The cursor returned by the previous page, if any.
         limit: The maximum number of sessions to return.
         active_only: Whether to return only active sessions.
         db: The database session.
         
     Returns:
-        A list of sessions.
+        A page of sessions with the cursor for the next page.
     """
-    # Query sessions
-    query = db.query(SessionModel)
+    # Query sessions with their conversations eagerly loaded in one extra query
+    query = select(SessionModel).options(
+        sqlalchemy.orm.selectinload(SessionModel.conversations)
+    )
     
     # Filter active sessions if requested
     if active_only:
-        query = query.filter(SessionModel.is_active == True)
+        query = query.where(SessionModel.is_active == True)
     
     # Apply pagination
-    sessions = query.offset(skip).limit(limit).all()
+    sessions, next_cursor = await paginate(db, query, SessionModel, limit, cursor)
     
-    return sessions
+    return SessionPage(items=sessions, next_cursor=next_cursor)
 
 
 @router.get("/{session_id}", response_model=SessionResponse)
 async def get_session(
     session_id: str,
     include_conversations: bool = False,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Get a session by ID.
     
@@ -91,16 +95,17 @@ async def get_session(
         The session.
     """
     # Query session
-    query = db.query(SessionModel).filter(SessionModel.id == session_id)
+    query = select(SessionModel).where(SessionModel.id == session_id)
     
     # Include conversations if requested
     if include_conversations:
         query = query.options(
-            sqlalchemy.orm.joinedload(SessionModel.conversations)
+            sqlalchemy.orm.selectinload(SessionModel.conversations)
         )
     
     # Get session
-    session = query.first()
+    result = await db.execute(query)
+    session = result.scalars().first()
     
     # Raise exception if not found
     if not session:
@@ -116,7 +121,7 @@ async def get_session(
 async def update_session(
     session_id: str,
     session_data: SessionCreate,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Update a session.
     
@@ -129,7 +134,7 @@ async def update_session(
         The updated session.
     """
     # Get session
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+    session = await db.get(SessionModel, session_id)
     
     # Raise exception if not found
     if not session:
@@ -146,8 +151,8 @@ async def update_session(
     session.expiry_days = session_data.expiry_days
     
     # Commit changes
-    db.commit()
-    db.refresh(session)
+    await db.commit()
+    await db.refresh(session)
     
     return session
 
@@ -155,7 +160,7 @@ async def update_session(
 @router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_session(
     session_id: str,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Delete a session.
     
@@ -164,7 +169,7 @@ async def delete_session(
         db: The database session.
     """
     # Get session
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+    session = await db.get(SessionModel, session_id)
     
     # Raise exception if not found
     if not session:
@@ -177,31 +182,31 @@ async def delete_session(
     session.is_active = False
     
     # Commit changes
-    db.commit()
+    await db.commit()
 
 
-@router.get("/{session_id}/conversations", response_model=List[ConversationResponse])
+@router.get("/{session_id}/conversations", response_model=ConversationPage)
 async def list_session_conversations(
     session_id: str,
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     active_only: bool = True,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """List conversations for a session.
     
     Args:
         session_id: The ID of the session to list conversations for.
-        skip: The number of conversations to skip.
+        cursor: The cursor returned by the previous page, if any.
         limit: The maximum number of conversations to return.
         active_only: Whether to return only active conversations.
         db: The database session.
         
     Returns:
-        A list of conversations.
+        A page of conversations with the cursor for the next page.
     """
     # Check if session exists
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+    session = await db.get(SessionModel, session_id)
     
     # Raise exception if not found
     if not session:
@@ -211,15 +216,17 @@ async def list_session_conversations(
         )
     
     # Query conversations
-    query = db.query(ConversationModel).filter(
+    query = select(ConversationModel).where(
         ConversationModel.session_id == session_id
     )
     
     # Filter active conversations if requested
     if active_only:
-        query = query.filter(ConversationModel.is_active == True)
+        query = query.where(ConversationModel.is_active == True)
     
     # Apply pagination
-    conversations = query.offset(skip).limit(limit).all()
+    conversations, next_cursor = await paginate(
+        db, query, ConversationModel, limit, cursor
+    )
     
-    return conversations
+    return ConversationPage(items=conversations, next_cursor=next_cursor)
@@ -0,0 +1,100 @@
+"""Statistics routes for Deepdevflow."""
+
+import time
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import (
+    Agent as AgentModel,
+    Conversation as ConversationModel,
+    Message as MessageModel,
+    Session as SessionModel,
+    Task as TaskModel
+)
+from backend.utils.config import config
+from backend.utils.database import get_async_session
+from .schemas import CountStats, StatsResponse
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+# Cached stats shared by all requests on this worker
+_STATS_CACHE: Dict[str, Any] = {"expires_at": 0.0, "value": None}
+
+
+@router.get("/", response_model=StatsResponse)
+async def get_stats(
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_async_session)
+):
+    """Get aggregated counts for the dashboard.
+    
+    Each entity is counted with a single grouped query and the result is
+    cached for ``stats.cache_ttl`` seconds.
+    
+    Args:
+        refresh: Whether to bypass the cache.
+        db: The database session.
+    
+    Returns:
+        The aggregated statistics.
+    """
+    now = time.monotonic()
+    if not refresh and _STATS_CACHE["value"] is not None and now < _STATS_CACHE["expires_at"]:
+        return _STATS_CACHE["value"]
+    
+    # Count entities grouped by their active flag
+    sessions = await count_by_active(db, SessionModel)
+    conversations = await count_by_active(db, ConversationModel)
+    agents = await count_by_active(db, AgentModel)
+    
+    # Count messages
+    messages = (await db.execute(select(func.count(MessageModel.id)))).scalar_one()
+    
+    # Count tasks grouped by state
+    result = await db.execute(
+        select(TaskModel.state, func.count(TaskModel.id)).group_by(TaskModel.state)
+    )
+    tasks_by_state = {
+        (state.value if state is not None else "unknown"): count
+        for state, count in result.all()
+    }
+    
+    stats = StatsResponse(
+        sessions=sessions,
+        conversations=conversations,
+        agents=agents,
+        messages=messages,
+        tasks=sum(tasks_by_state.values()),
+        tasks_by_state=tasks_by_state
+    )
+    
+    # Cache result
+    _STATS_CACHE["value"] = stats
+    _STATS_CACHE["expires_at"] = now + config.get("stats.cache_ttl", 10)
+    
+    return stats
+
+
+async def count_by_active(db: AsyncSession, model: Any) -> CountStats:
+    """Count rows of a model grouped by their ``is_active`` flag.
+    
+    Args:
+        db: The database session.
+        model: The model class to count.
+    
+    Returns:
+        The total and active counts.
+    """
+    result = await db.execute(
+        select(model.is_active, func.count(model.id)).group_by(model.is_active)
+    )
+    
+    counts = CountStats()
+    for is_active, count in result.all():
+        counts.total += count
+        if is_active:
+            counts.active += count
+    
+    return counts
@@ -3,9 +3,20 @@
 from .base import Agent
 from .host_agent import HostAgent
 from .remote_agent_connection import RemoteAgentConnection
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .health_monitor import HealthMonitor
+from .task_poller import TaskPoller
+from .session_service import SqlSessionService
+from .context_builder import ContextBuilder
 
 __all__ = [
     "Agent",
     "HostAgent",
     "RemoteAgentConnection",
+    "CircuitBreaker",
+    "CircuitState",
+    "HealthMonitor",
+    "TaskPoller",
+    "SqlSessionService",
+    "ContextBuilder",
 ]
@@ -22,11 +22,12 @@ class Agent(ABC):
         pass
     
     @abstractmethod
-    async def create_task(self, message: Message) -> Task:
+    async def create_task(self, message: Message, agent_id: Optional[str] = None) -> Task:
         """Create a task from a message.
         
         Args:
             message: The message to create a task from.
+            agent_id: The ID of the agent the message was routed to, if already known.
             
         Returns:
             The created task.
@@ -0,0 +1,79 @@
+"""Circuit breaker implementation for remote agents in Deepdevflow."""
+
+import enum
+import time
+
+
+class CircuitState(enum.Enum):
+    """Possible states for a circuit breaker."""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-agent circuit breaker.
+    
+    The circuit opens after ``failure_threshold`` consecutive failures and
+    rejects requests until ``reset_timeout`` has passed. It then lets a
+    single trial request through (half-open): success closes the circuit,
+    failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        """Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to wait before trying an open circuit again.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently rejected without a trial being due."""
+        if self.state == CircuitState.CLOSED:
+            return False
+        
+        # A trial that never reported back expires like an open period
+        waiting = time.monotonic() - self._opened_at < self.reset_timeout
+        return waiting and (self.state == CircuitState.OPEN or self._trial_in_flight)
+    
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, starting a trial when one is due.
+        
+        Returns:
+            True if the request may be sent, False if it should fail fast.
+        """
+        if self.state == CircuitState.CLOSED:
+            return True
+        
+        if self.is_open:
+            return False
+        
+        # Let a single trial request through
+        self.state = CircuitState.HALF_OPEN
+        self._trial_in_flight = True
+        self._opened_at = time.monotonic()
+        return True
+    
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if needed."""
+        self.failures += 1
+        self._trial_in_flight = False
+        
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
@@ -0,0 +1,247 @@
+"""Token-budgeted context window for the host agent in Deepdevflow."""
+
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.genai import types
+
+from backend.services.llm_service import llm_service
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Session state keys holding the compacted history
+SUMMARY_KEY = "context_summary"
+FOLDED_KEY = "context_folded"
+
+SUMMARY_PROMPT = """Update the running summary of a conversation with the new turns below.
+Keep facts, user preferences, decisions, open tasks and which agents handled what.
+Reply with the updated summary only, in at most {max_words} words.
+
+Current summary:
+{summary}
+
+New turns:
+{turns}
+"""
+
+
+class ContextBuilder:
+    """Keeps the conversation history sent to the model under a token budget.
+    
+    The newest turns are sent verbatim. Once the history exceeds
+    ``max_tokens``, the oldest turns are folded into a running summary until
+    it is back under ``compact_to`` of the budget, so compaction only runs
+    every few turns. The summary is updated from the previous summary and the
+    newly folded turns only, and is kept in the session state together with
+    the number of turns it covers.
+    
+    ADK calls model callbacks synchronously, so folding, which calls the
+    LLM, runs in ``compact`` before the turn, and the model callback only
+    applies the result with ``build``.
+    """
+    
+    MEMO_SIZE = 4096
+    
+    def __init__(
+        self,
+        max_tokens: int = 8000,
+        compact_to: float = 0.5,
+        summary_tokens: int = 500,
+        tokenizer: Optional[str] = "cl100k_base"
+    ):
+        """Initialize the context builder.
+        
+        Args:
+            max_tokens: Token budget of the history sent to the model.
+            compact_to: Fraction of the budget the history is compacted to.
+            summary_tokens: Token budget of the running summary.
+            tokenizer: The tiktoken encoding used to count tokens. Tokens are
+                estimated from the text length if it is not available.
+        """
+        self.max_tokens = max_tokens
+        self.compact_to = compact_to
+        self.summary_tokens = summary_tokens
+        self._encoding = self._load_encoding(tokenizer)
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+    
+    def _load_encoding(self, tokenizer: Optional[str]) -> Any:
+        """Load a tiktoken encoding, or None to estimate token counts."""
+        if not tokenizer:
+            return None
+        try:
+            import tiktoken
+            return tiktoken.get_encoding(tokenizer)
+        except Exception as e:
+            logger.info(f"Tokenizer {tokenizer} unavailable, estimating token counts: {e}")
+            return None
+    
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of a text.
+        
+        Args:
+            text: The text to count.
+        
+        Returns:
+            The number of tokens.
+        """
+        if not text:
+            return 0
+        
+        count = self._counts.get(text)
+        if count is not None:
+            self._counts.move_to_end(text)
+            return count
+        
+        if self._encoding is not None:
+            count = len(self._encoding.encode(text, disallowed_special=()))
+        else:
+            count = len(text) // 4 + 1
+        
+        self._counts[text] = count
+        while len(self._counts) > self.MEMO_SIZE:
+            self._counts.popitem(last=False)
+        return count
+    
+    def count_content_tokens(self, content: types.Content) -> int:
+        """Count the tokens of a conversation turn, including message overhead.
+        
+        Args:
+            content: The turn to count.
+        
+        Returns:
+            The number of tokens.
+        """
+        return self.count_tokens(self._get_text(content)) + 4
+    
+    async def compact(self, contents: List[types.Content], state: Any) -> Dict[str, Any]:
+        """Fold the oldest turns into the running summary if the history is over budget.
+        
+        Args:
+            contents: The full conversation history, oldest first.
+            state: The session state holding the running summary.
+        
+        Returns:
+            The state delta with the updated summary, empty if nothing was folded.
+        """
+        summary, folded = self._get_summary(contents, state)
+        
+        tokens = self.count_tokens(summary) + sum(
+            self.count_content_tokens(content) for content in contents[folded:]
+        )
+        if tokens <= self.max_tokens:
+            return {}
+        
+        cut = self._get_cut(contents, folded, tokens, self.max_tokens * self.compact_to)
+        try:
+            summary = await self._summarize(summary, contents[folded:cut])
+        except Exception as e:
+            # The model callback trims the window instead; folding is retried next turn
+            logger.error(f"Error summarizing conversation history: {e}")
+            return {}
+        
+        logger.info(f"Folded {cut - folded} turns into the conversation summary")
+        return {SUMMARY_KEY: summary, FOLDED_KEY: cut}
+    
+    def build(self, contents: List[types.Content], state: Any) -> List[types.Content]:
+        """Build the history to send to the model.
+        
+        Turns the running summary does not cover are sent verbatim. If they
+        still exceed the budget, e.g. because folding failed or a turn made
+        many tool calls, the oldest of them are dropped without summarizing.
+        
+        Args:
+            contents: The full conversation history, oldest first.
+            state: The session state holding the running summary.
+        
+        Returns:
+            The running summary followed by the most recent turns.
+        """
+        summary, folded = self._get_summary(contents, state)
+        
+        tokens = self.count_tokens(summary) + sum(
+            self.count_content_tokens(content) for content in contents[folded:]
+        )
+        cut = folded
+        if tokens > self.max_tokens:
+            cut = self._get_cut(contents, folded, tokens, self.max_tokens)
+            logger.warning(f"Dropped {cut - folded} unsummarized turns to fit the token budget")
+        
+        return self._with_summary(summary, contents[cut:])
+    
+    def _get_summary(self, contents: List[types.Content], state: Any) -> Tuple[str, int]:
+        """Get the running summary and the number of turns it covers."""
+        summary = state.get(SUMMARY_KEY, "")
+        folded = state.get(FOLDED_KEY, 0)
+        if folded > len(contents):
+            return "", 0
+        return summary, folded
+    
+    def _get_cut(self, contents: List[types.Content], start: int, tokens: int, target: float) -> int:
+        """Get the index of the first turn to keep so the history fits a target.
+        
+        Args:
+            contents: The full conversation history, oldest first.
+            start: The index of the first turn that may be dropped.
+            tokens: The current number of tokens from ``start`` on.
+            target: The number of tokens to get under.
+        
+        Returns:
+            The index of the first kept turn.
+        """
+        # Drop the oldest turns, always keeping the current one
+        cut = start
+        while tokens > target and cut < len(contents) - 1:
+            tokens -= self.count_content_tokens(contents[cut])
+            cut += 1
+        
+        # Never start the window with the response to a dropped tool call
+        while cut < len(contents) - 1 and self._is_function_response(contents[cut]):
+            cut += 1
+        return cut
+    
+    async def _summarize(self, summary: str, contents: List[types.Content]) -> str:
+        """Fold turns into the running summary."""
+        turns = "\n".join(
+            f"{content.role}: {self._get_text(content)}" for content in contents
+        )
+        prompt = SUMMARY_PROMPT.format(
+            max_words=int(self.summary_tokens * 0.75),
+            summary=summary or "(none)",
+            turns=turns
+        )
+        return (await llm_service.generate(
+            prompt,
+            temperature=0,
+            max_tokens=self.summary_tokens
+        )).strip()
+    
+    def _with_summary(self, summary: str, contents: List[types.Content]) -> List[types.Content]:
+        """Prepend the running summary to the recent turns."""
+        if not summary:
+            return list(contents)
+        return [
+            types.Content(
+                role="user",
+                parts=[types.Part(text=f"Summary of the earlier conversation:\n{summary}")]
+            ),
+            *contents
+        ]
+    
+    def _get_text(self, content: types.Content) -> str:
+        """Get the text of a turn, including tool calls and responses."""
+        texts = []
+        for part in content.parts or []:
+            if part.text:
+                texts.append(part.text)
+            elif part.function_call:
+                texts.append(f"{part.function_call.name}({json.dumps(part.function_call.args, default=str)})")
+            elif part.function_response:
+                texts.append(json.dumps(part.function_response.response, default=str))
+        return "\n".join(texts)
+    
+    def _is_function_response(self, content: types.Content) -> bool:
+        """Check whether a turn answers a tool call."""
+        return any(part.function_response for part in content.parts or [])
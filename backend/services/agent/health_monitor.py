@@ -0,0 +1,73 @@
+"""Background health monitor for remote agents in Deepdevflow."""
+
+import asyncio
+import logging
+from typing import Callable, Iterable, Optional
+
+from .remote_agent_connection import RemoteAgentConnection
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Periodically probes remote agents to drive their circuit breakers."""
+    
+    def __init__(
+        self,
+        get_agents: Callable[[], Iterable[RemoteAgentConnection]],
+        interval: float = 5
+    ):
+        """Initialize the health monitor.
+        
+        Args:
+            get_agents: Returns the remote agents to probe.
+            interval: Seconds between probe rounds.
+        """
+        self.get_agents = get_agents
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start probing in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Health monitor started (interval {self.interval}s)")
+    
+    async def stop(self) -> None:
+        """Stop probing."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Health monitor stopped")
+    
+    async def check_all(self) -> None:
+        """Probe every remote agent concurrently."""
+        agents = list(self.get_agents())
+        if not agents:
+            return
+        
+        results = await asyncio.gather(
+            *[agent.health_check() for agent in agents],
+            return_exceptions=True
+        )
+        
+        for agent, healthy in zip(agents, results):
+            if healthy is not True:
+                logger.warning(
+                    f"Remote agent {agent.name} is unhealthy "
+                    f"(circuit {agent.circuit_breaker.state.value})"
+                )
+    
+    async def _run(self) -> None:
+        """Run probe rounds until stopped."""
+        while True:
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.error(f"Error checking remote agent health: {e}")
+            await asyncio.sleep(self.interval)
@@ -4,11 +4,11 @@ import asyncio
 import json
 import uuid
 import logging
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Union, AsyncGenerator
 
 from google.adk import Agent as ADKAgent, Runner
 from google.adk.models.lite_llm import LiteLlm
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.events.event import Event as ADKEvent
@@ -16,11 +16,21 @@ from google.adk.events.event_actions import EventActions as ADKEventActions
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.tools.tool_context import ToolContext
+from google.genai import types
 
 from backend.models import Message, Task, Agent as AgentModel, TaskState
 from backend.utils.config import config
+from backend.services.routing import (
+    RoutingStrategy,
+    CapabilityMatchStrategy,
+    RoundRobinStrategy,
+    WeightedStrategy,
+)
 from .base import Agent
+from .context_builder import ContextBuilder
 from .remote_agent_connection import RemoteAgentConnection
+from .session_service import SqlSessionService
+from .task_poller import TaskPoller
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -29,18 +39,63 @@ logger = logging.getLogger(__name__)
 class HostAgent(Agent):
     """Host agent implementation using Google ADK."""
     
+    # Maximum number of task-to-agent entries to remember
+    TASK_INDEX_SIZE = 10000
+    
     def __init__(self):
         """Initialize host agent with configuration."""
         # Get agent configuration
         self.agent_config = config.get_agent_config("host_agent")
         
         # Initialize session and memory services
-        self.session_service = InMemorySessionService()
+        session_config = config.get_agent_config("sessions")
+        self.session_service = SqlSessionService(
+            max_cached=session_config.get("max_cached", 1000),
+            idle_timeout=session_config.get("idle_timeout", 1800)
+        )
         self.memory_service = InMemoryMemoryService()
         self.artifact_service = InMemoryArtifactService()
         
+        # Initialize the token budget of the conversation history
+        context_config = config.get_agent_config("context")
+        self.context_builder = ContextBuilder(
+            max_tokens=context_config.get("max_tokens", 8000),
+            compact_to=context_config.get("compact_to", 0.5),
+            summary_tokens=context_config.get("summary_tokens", 500),
+            tokenizer=context_config.get("tokenizer", "cl100k_base")
+        )
+        
         # Initialize remote agent connections
         self.remote_agents: Dict[str, RemoteAgentConnection] = {}
+        self.remote_agent_ids: Dict[str, str] = {}
+        
+        # Instruction prefix cache, rebuilt when the roster version changes
+        self.roster_version = 0
+        self._instruction_prefix: Optional[str] = None
+        self._instruction_prefix_version = -1
+        
+        # Index of the agent each task was sent to
+        self.task_agents: "OrderedDict[str, str]" = OrderedDict()
+        connection_config = config.get_agent_config("connection")
+        self.status_fanout_timeout = connection_config.get("status_fanout_timeout", 2)
+        self.parallel_task_timeout = connection_config.get("parallel_task_timeout", 20)
+        
+        # Initialize polling of unfinished remote tasks
+        polling_config = connection_config.get("polling", {})
+        self.task_poller = TaskPoller(
+            min_interval=polling_config.get("min_interval", 1),
+            max_interval=polling_config.get("max_interval", 30),
+            backoff=polling_config.get("backoff", 1.5),
+            max_age=polling_config.get("max_age", 3600)
+        )
+        
+        # Initialize routing
+        self.routing_config = config.get_agent_config("routing")
+        self.router = self._create_router()
+        
+        # Index ranking the agents listed in the prompt
+        self.shortlist_size = self.routing_config.get("shortlist_size", 10)
+        self.agent_index = self._create_agent_index()
         
         # Create ADK agent
         self.adk_agent = self._create_adk_agent()
@@ -73,10 +128,70 @@ class HostAgent(Agent):
             tools=[
                 self.list_remote_agents,
                 self.send_task,
+                self.send_tasks_parallel,
                 self.check_task_status
             ]
         )
     
+    def _create_router(self) -> RoutingStrategy:
+        """Create the routing strategy selected by routing.default_strategy.
+        
+        Returns:
+            The routing strategy used to pick remote agents for queries.
+        """
+        strategy_name = self.routing_config.get("default_strategy", "capability_match")
+        strategies_config = self.routing_config.get("strategies", {})
+        
+        if strategy_name == "round_robin":
+            return RoundRobinStrategy()
+        
+        if strategy_name == "weighted":
+            return WeightedStrategy(
+                weights=strategies_config.get("weighted", {}),
+                load=self._get_agent_load
+            )
+        
+        if strategy_name != "capability_match":
+            logger.warning(f"Unknown routing strategy {strategy_name}, using capability_match")
+        
+        strategy_config = strategies_config.get("capability_match", {})
+        return CapabilityMatchStrategy(
+            threshold=strategy_config.get("threshold", 0.8),
+            margin=strategy_config.get("margin", 0.05),
+            weights=strategy_config.get("weights", {})
+        )
+    
+    def _create_agent_index(self) -> CapabilityMatchStrategy:
+        """Create the index that shortlists agents for the prompt.
+        
+        The router is reused when it already matches capabilities, so agent
+        profiles are only embedded once.
+        
+        Returns:
+            The capability index over the remote agents.
+        """
+        if isinstance(self.router, CapabilityMatchStrategy):
+            return self.router
+        
+        strategy_config = self.routing_config.get("strategies", {}).get("capability_match", {})
+        return CapabilityMatchStrategy(
+            threshold=strategy_config.get("threshold", 0.8),
+            margin=strategy_config.get("margin", 0.05),
+            weights=strategy_config.get("weights", {})
+        )
+    
+    def _get_agent_load(self, agent_name: str) -> int:
+        """Get the number of pending tasks of a remote agent.
+        
+        Args:
+            agent_name: The name of the agent.
+            
+        Returns:
+            The number of tasks sent to the agent that have not finished yet.
+        """
+        agent = self.remote_agents.get(agent_name)
+        return len(agent.pending_tasks) if agent else 0
+    
     def _get_root_instruction(self, context: ReadonlyContext) -> str:
         """Get root instruction for the host agent.
         
@@ -86,35 +201,96 @@ class HostAgent(Agent):
         Returns:
             The root instruction string.
         """
-        # Get the instruction from config
-        instruction = self.agent_config.get("instruction", "")
-        
         # Get the current state
-        state = context.state
         current_agent = self._check_state(context)
         
-        # Add available agents to the instruction
-        agent_info = []
-        for agent in self.remote_agents.values():
-            agent_info.append(json.dumps({
-                "name": agent.name,
-                "description": agent.description
-            }))
-        agents_str = "\n".join(agent_info)
-        
         # Add current agent information
         current_agent_str = current_agent.get("active_agent", "None")
         
-        # Format the full instruction
-        full_instruction = f"""
+        # Format the full instruction, keeping the per-turn part last
+        return f"{self._get_instruction_prefix()}Current agent: {current_agent_str}\n"
+    
+    def _get_instruction_prefix(self) -> str:
+        """Get the instruction and small agent rosters, rebuilt only when the roster changes.
+        
+        Agents are listed by name so the prefix is byte-identical across turns
+        and workers, which lets provider-side prompt caching reuse it.
+        
+        Returns:
+            The instruction prefix string.
+        """
+        if self._instruction_prefix_version == self.roster_version:
+            return self._instruction_prefix
+        
+        # Get the instruction from config
+        instruction = self.agent_config.get("instruction", "")
+        
+        # List small rosters in full; larger ones are shortlisted per message
+        if len(self.remote_agents) <= self.shortlist_size:
+            agents_str = self._format_agents(sorted(self.remote_agents))
+            self._instruction_prefix = f"""
 {instruction}
 
 Agents:
 {agents_str}
 
-Current agent: {current_agent_str}
 """
-        return full_instruction
+        else:
+            self._instruction_prefix = f"""
+{instruction}
+
+"""
+        self._instruction_prefix_version = self.roster_version
+        return self._instruction_prefix
+    
+    def _format_agents(self, agent_names: List[str]) -> str:
+        """Format remote agents for the instruction, one JSON object per line.
+        
+        Args:
+            agent_names: The names of the agents to format.
+            
+        Returns:
+            The formatted agents.
+        """
+        return "\n".join(
+            json.dumps({
+                "name": self.remote_agents[name].name,
+                "description": self.remote_agents[name].description
+            })
+            for name in agent_names
+        )
+    
+    def _get_agent_shortlist(self, llm_request) -> Optional[str]:
+        """Get the instruction listing the agents most relevant to the user message.
+        
+        Model callbacks cannot await, so the agents are ranked from the scores
+        computed for the message by ``process_message`` before the run.
+        
+        Args:
+            llm_request: The LLM request.
+            
+        Returns:
+            The shortlist instruction, or None if the full roster is already listed.
+        """
+        if len(self.remote_agents) <= self.shortlist_size:
+            return None
+        
+        # Rank agents against the latest user text
+        query = ""
+        for content in reversed(llm_request.contents or []):
+            texts = [part.text for part in content.parts or [] if part.text]
+            if content.role == "user" and texts:
+                query = "\n".join(texts)
+                break
+        
+        agent_names = self.agent_index.rank_cached(query, self.shortlist_size)
+        agent_names = [name for name in agent_names if name in self.remote_agents]
+        
+        return (
+            f"Agents most relevant to this message "
+            f"(call list_remote_agents to see all {len(self.remote_agents)} agents):\n"
+            f"{self._format_agents(agent_names)}"
+        )
     
     def _check_state(self, context: ReadonlyContext) -> Dict[str, Any]:
         """Check the state of the context.
@@ -136,6 +312,9 @@ Current agent: {current_agent_str}
     def _before_model_callback(self, callback_context: CallbackContext, llm_request):
         """Callback before the model is called.
         
+        ADK calls this synchronously, so the work that needs to await runs
+        in ``process_message`` before the turn and is only applied here.
+        
         Args:
             callback_context: The callback context.
             llm_request: The LLM request.
@@ -145,6 +324,14 @@ Current agent: {current_agent_str}
             if 'session_id' not in state:
                 state['session_id'] = str(uuid.uuid4())
             state['session_active'] = True
+        
+        # List the agents relevant to the message after the cached prefix
+        shortlist = self._get_agent_shortlist(llm_request)
+        if shortlist:
+            llm_request.append_instructions([shortlist])
+        
+        # Keep the replayed history within the token budget
+        llm_request.contents = self.context_builder.build(llm_request.contents, state)
     
     async def list_remote_agents(self):
         """List available remote agents.
@@ -177,8 +364,16 @@ Current agent: {current_agent_str}
         if agent_name not in self.remote_agents:
             raise ValueError(f"Agent {agent_name} not found")
         
-        # Update state
+        # Enforce the hop limit and break delegation loops
         state = tool_context.state
+        agent_name = self._record_hop(agent_name, state, tool_context.invocation_id)
+        if agent_name is None:
+            return [
+                "Delegation limit reached for this request. "
+                "Answer the user directly with the information gathered so far."
+            ]
+        
+        # Update state
         state['agent'] = agent_name
         
         # Get agent
@@ -190,28 +385,16 @@ Current agent: {current_agent_str}
         else:
             task_id = str(uuid.uuid4())
         
-        # Get session ID
-        session_id = state['session_id']
-        
         # Create task parameters
-        task_params = {
-            "id": task_id,
-            "sessionId": session_id,
-            "message": {
-                "role": "user",
-                "content": message,
-                "metadata": {
-                    "conversation_id": session_id,
-                    "message_id": str(uuid.uuid4())
-                }
-            }
-        }
+        task_params = self._create_task_params(task_id, state['session_id'], message)
         
         # Send task to remote agent
+        self._index_task(task_id, agent_name)
         task = await agent.send_task(task_params)
+        self.task_poller.track(agent, task.id, task.state)
         
         # Update session state
-        state['session_active'] = task.status.state not in [
+        state['session_active'] = task.state not in [
             TaskState.COMPLETED,
             TaskState.CANCELED,
             TaskState.FAILED,
@@ -219,29 +402,272 @@ Current agent: {current_agent_str}
         ]
         
         # Handle task state
-        if task.status.state == TaskState.INPUT_REQUIRED:
+        if task.state == TaskState.INPUT_REQUIRED:
             # Force user input back
             tool_context.actions.skip_summarization = True
             tool_context.actions.escalate = True
-        elif task.status.state == TaskState.CANCELED:
+        elif task.state == TaskState.CANCELED:
             raise ValueError(f"Agent {agent_name} task {task.id} is cancelled")
-        elif task.status.state == TaskState.FAILED:
+        elif task.state == TaskState.FAILED:
             raise ValueError(f"Agent {agent_name} task {task.id} failed")
         
         # Process response
+        return self._get_task_response(task)
+    
+    async def send_tasks_parallel(
+        self,
+        agent_names: List[str],
+        message: str,
+        tool_context: ToolContext
+    ):
+        """Send the same task to several remote agents at once.
+        
+        Use this instead of several send_task calls when a request needs more
+        than one specialist. Each agent has its own deadline; the results of
+        the agents that finished in time are returned.
+        
+        Args:
+            agent_names: The names of the agents to send the task to.
+            message: The message to send to the agents.
+            tool_context: The tool context.
+            
+        Returns:
+            A list with the status and response of each agent.
+        """
+        # Count the whole fan-out as a single hop
+        state = tool_context.state
+        agent_names = list(dict.fromkeys(agent_names))
+        group = " + ".join(agent_names)
+        hop = self._record_hop(group, state, tool_context.invocation_id)
+        if hop is None:
+            return [
+                "Delegation limit reached for this request. "
+                "Answer the user directly with the information gathered so far."
+            ]
+        if hop != group:
+            agent_names = [hop]
+        
+        results = await asyncio.gather(*[
+            self._send_with_deadline(agent_name, message, state['session_id'])
+            for agent_name in agent_names
+        ])
+        
+        state['agent'] = group
+        return results
+    
+    async def _send_with_deadline(
+        self,
+        agent_name: str,
+        message: str,
+        session_id: str
+    ) -> Dict[str, Any]:
+        """Send a task to one agent of a parallel fan-out.
+        
+        Args:
+            agent_name: The name of the agent.
+            message: The message to send to the agent.
+            session_id: The ID of the session.
+            
+        Returns:
+            A dictionary with the agent name, outcome and response.
+        """
+        agent = self.remote_agents.get(agent_name)
+        if agent is None:
+            return {"agent": agent_name, "status": "not_found", "response": []}
+        
+        task_id = str(uuid.uuid4())
+        self._index_task(task_id, agent_name)
+        
+        try:
+            task = await asyncio.wait_for(
+                agent.send_task(self._create_task_params(task_id, session_id, message)),
+                timeout=self.parallel_task_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Agent {agent_name} missed the {self.parallel_task_timeout}s deadline")
+            return {"agent": agent_name, "status": "timeout", "response": []}
+        except Exception as e:
+            # One failing agent must not discard the results of the others
+            logger.error(f"Error sending task to agent {agent_name}: {e}")
+            return {"agent": agent_name, "status": "error", "response": [str(e)]}
+        
+        if task is None:
+            return {"agent": agent_name, "status": "error", "response": []}
+        
+        # Keep following tasks the agent is still working on
+        if task.state in [TaskState.SUBMITTED, TaskState.WORKING]:
+            self.task_poller.track(agent, task.id, task.state)
+        
+        return {
+            "agent": agent_name,
+            "status": task.state.value,
+            "response": self._get_task_response(task)
+        }
+    
+    def _get_task_response(self, task: Task) -> List[str]:
+        """Collect the message content and artifacts of a task.
+        
+        Args:
+            task: The task returned by a remote agent.
+            
+        Returns:
+            A list of response parts.
+        """
         response = []
         
         # Add message content if available
-        if task.status.message:
-            response.append(task.status.message.content)
+        message = task.metadata_json.get("message")
+        if message:
+            response.append(message)
         
         # Add artifacts if available
-        if task.artifacts:
-            for artifact in task.artifacts:
-                response.append(json.dumps(artifact))
+        for artifact in task.artifacts_json:
+            response.append(self._get_artifact_text(artifact))
         
         return response
     
+    def _record_hop(self, agent_name: str, state: Any, invocation_id: str) -> Optional[str]:
+        """Account for a delegation hop in the current turn.
+        
+        Hops are counted per invocation in the session state. A request that
+        would exceed routing.max_hop_count, or bounce back to the agent that
+        delegated two hops ago (A -> B -> A), is redirected to the fallback agent.
+        
+        Args:
+            agent_name: The name of the agent the model wants to delegate to.
+            state: The session state of the tool context.
+            invocation_id: The ID of the current invocation.
+            
+        Returns:
+            The name of the agent to delegate to, or None if the host agent
+            should answer directly.
+        """
+        # Start a new hop path for each user turn
+        if state.get('hop_invocation_id') != invocation_id:
+            state['hop_invocation_id'] = invocation_id
+            state['hop_path'] = []
+        
+        path = list(state.get('hop_path', []))
+        max_hops = self.routing_config.get("max_hop_count", 3)
+        
+        if len(path) >= max_hops:
+            logger.warning(f"Max hop count {max_hops} reached, not delegating to {agent_name}")
+            return None
+        
+        if len(path) >= 2 and path[-2] == agent_name and path[-1] != agent_name:
+            # Short-circuit ping-pong to the fallback agent
+            fallback = self.routing_config.get("fallback_agent", "host_agent")
+            logger.warning(
+                f"Delegation loop detected ({' -> '.join(path + [agent_name])}), "
+                f"falling back to {fallback}"
+            )
+            if fallback not in self.remote_agents or fallback in path[-2:]:
+                return None
+            agent_name = fallback
+        
+        state['hop_path'] = path + [agent_name]
+        return agent_name
+    
+    def _create_task_params(self, task_id: str, session_id: str, message: str) -> Dict[str, Any]:
+        """Create the parameters of a remote task.
+        
+        Args:
+            task_id: The ID of the task.
+            session_id: The ID of the session the task belongs to.
+            message: The message to send to the agent.
+            
+        Returns:
+            The task parameters.
+        """
+        return {
+            "id": task_id,
+            "sessionId": session_id,
+            "message": {
+                "role": "user",
+                "content": message,
+                "metadata": {
+                    "conversation_id": session_id,
+                    "message_id": str(uuid.uuid4())
+                }
+            }
+        }
+    
+    async def delegate_message(self, agent_name: str, message: Message) -> AsyncGenerator[str, None]:
+        """Send a message straight to a remote agent chosen by the router.
+        
+        This skips the model call the host agent would otherwise spend
+        deciding to invoke the send_task tool.
+        
+        Args:
+            agent_name: The name of the agent to delegate to.
+            message: The message to delegate.
+            
+        Yields:
+            Chunks of the response, streamed while the remote agent works.
+        """
+        agent = self.remote_agents[agent_name]
+        session_id = message.conversation_id or str(uuid.uuid4())
+        task_id = str(uuid.uuid4())
+        
+        # Stream task updates from the remote agent
+        self._index_task(task_id, agent_name)
+        update = None
+        async for update in agent.send_task_streaming(
+            self._create_task_params(task_id, session_id, message.content)
+        ):
+            if update["state"] in [TaskState.CANCELED, TaskState.FAILED]:
+                yield f"Agent {agent_name} could not complete the task."
+                return
+            
+            # Yield status messages and artifacts as they arrive
+            if update["message"]:
+                yield update["message"]
+            if update["artifact"]:
+                yield self._get_artifact_text(update["artifact"])
+        
+        if update is None or update["final"]:
+            return
+        
+        # Follow tasks the agent is still working on through the poller
+        self.task_poller.track(agent, task_id, update["state"])
+        if update["state"] not in [TaskState.SUBMITTED, TaskState.WORKING]:
+            return
+        
+        async for update in self.task_poller.watch(task_id):
+            if update["state"] in [TaskState.CANCELED, TaskState.FAILED, TaskState.UNKNOWN]:
+                yield f"Agent {agent_name} could not complete the task."
+                return
+            
+            if update["message"]:
+                yield update["message"]
+            if update["final"]:
+                for artifact in update["artifacts"]:
+                    yield self._get_artifact_text(artifact)
+    
+    def _get_artifact_text(self, artifact: Dict[str, Any]) -> str:
+        """Get the text of an artifact, or its JSON if it has no text parts.
+        
+        Args:
+            artifact: The artifact.
+            
+        Returns:
+            The artifact as text.
+        """
+        texts = [part.get("text", "") for part in artifact.get("parts", []) if part.get("text")]
+        return "".join(texts) if texts else json.dumps(artifact)
+    
+    def _index_task(self, task_id: str, agent_name: str) -> None:
+        """Remember which agent a task was sent to.
+        
+        Args:
+            task_id: The ID of the task.
+            agent_name: The name of the agent.
+        """
+        self.task_agents[task_id] = agent_name
+        self.task_agents.move_to_end(task_id)
+        while len(self.task_agents) > self.TASK_INDEX_SIZE:
+            self.task_agents.popitem(last=False)
+    
     async def check_task_status(self, task_id: str):
         """Check the status of a task.
         
@@ -251,21 +677,87 @@ Current agent: {current_agent_str}
         Returns:
             A dictionary with the task status.
         """
-        # Check task status across all agents
-        for agent in self.remote_agents.values():
+        # Answer from the poller while it follows the task
+        state = self.task_poller.get_state(task_id)
+        if state is not None:
+            return {"id": task_id, "state": str(state), "agent": self.task_agents.get(task_id, "None")}
+        
+        # Ask the agent the task was sent to
+        agent = self.remote_agents.get(self.task_agents.get(task_id))
+        if agent is not None:
             try:
                 task = await agent.get_task_status(task_id)
                 if task:
-                    return {
-                        "id": task.id,
-                        "state": str(task.status.state),
-                        "agent": agent.name
-                    }
+                    return self._format_task_status(task, agent.name)
             except Exception as e:
                 logger.error(f"Error checking task status: {e}")
         
+        # Otherwise ask every other agent concurrently
+        candidates = [a for a in self.remote_agents.values() if a is not agent]
+        task, owner = await self._find_task(task_id, candidates)
+        if task:
+            self._index_task(task_id, owner.name)
+            return self._format_task_status(task, owner.name)
+        
         return {"id": task_id, "state": "UNKNOWN", "agent": "None"}
     
+    async def _find_task(self, task_id: str, agents: List[RemoteAgentConnection]):
+        """Query agents concurrently for a task, stopping at the first hit.
+        
+        Args:
+            task_id: The ID of the task to find.
+            agents: The agents to query.
+            
+        Returns:
+            A tuple of (task, agent), or (None, None) if no agent answered
+            within the fan-out timeout.
+        """
+        lookups = {
+            asyncio.ensure_future(agent.get_task_status(task_id)): agent
+            for agent in agents
+        }
+        pending = set(lookups)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.status_fanout_timeout
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0, deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                
+                for lookup in done:
+                    if lookup.exception() is not None:
+                        logger.error(f"Error checking task status: {lookup.exception()}")
+                    elif lookup.result():
+                        return lookup.result(), lookups[lookup]
+        finally:
+            # Cancel the lookups still in flight
+            for lookup in pending:
+                lookup.cancel()
+        
+        return None, None
+    
+    def _format_task_status(self, task: Task, agent_name: str) -> Dict[str, str]:
+        """Format a task status for the model.
+        
+        Args:
+            task: The task.
+            agent_name: The name of the agent owning the task.
+            
+        Returns:
+            A dictionary with the task status.
+        """
+        return {
+            "id": task.id,
+            "state": str(task.state),
+            "agent": agent_name
+        }
+    
     async def register_remote_agent(self, agent_model: AgentModel) -> bool:
         """Register a remote agent.
         
@@ -290,6 +782,21 @@ Current agent: {current_agent_str}
             
             # Add to remote agents
             self.remote_agents[agent_model.name] = agent
+            self.remote_agent_ids[agent_model.name] = agent_model.id
+            self.roster_version += 1
+            
+            # Add to the routing table and the prompt index
+            await self.router.add_agent(
+                agent_model.name,
+                agent_model.description,
+                agent_model.capabilities_list
+            )
+            if self.agent_index is not self.router:
+                await self.agent_index.add_agent(
+                    agent_model.name,
+                    agent_model.description,
+                    agent_model.capabilities_list
+                )
             
             logger.info(f"Registered remote agent: {agent_model.name}")
             return True
@@ -297,6 +804,32 @@ Current agent: {current_agent_str}
             logger.error(f"Failed to register remote agent: {e}")
             return False
     
+    async def unregister_remote_agent(self, agent_name: str) -> bool:
+        """Unregister a remote agent.
+        
+        Args:
+            agent_name: The name of the agent to unregister.
+            
+        Returns:
+            True if the agent was registered, False otherwise.
+        """
+        if agent_name not in self.remote_agents:
+            return False
+        
+        # Remove from remote agents and the routing table
+        agent = self.remote_agents.pop(agent_name)
+        self.task_poller.untrack_agent(agent)
+        for task_id in [t for t, name in self.task_agents.items() if name == agent_name]:
+            del self.task_agents[task_id]
+        self.remote_agent_ids.pop(agent_name, None)
+        self.roster_version += 1
+        self.router.remove_agent(agent_name)
+        if self.agent_index is not self.router:
+            self.agent_index.remove_agent(agent_name)
+        
+        logger.info(f"Unregistered remote agent: {agent_name}")
+        return True
+    
     async def process_message(self, message: Message) -> AsyncGenerator[str, None]:
         """Process a message and generate a response.
         
@@ -313,12 +846,22 @@ Current agent: {current_agent_str}
             user_id="user",  # TODO: Use actual user ID
             session_id=session_id
         )
+        if session is None:
+            session = self.session_service.create_session(
+                app_name=config.app_name,
+                user_id="user",  # TODO: Use actual user ID
+                session_id=session_id
+            )
         
         # Create message for ADK
-        adk_message = {
-            "role": message.role,
-            "content": message.content
-        }
+        adk_message = types.Content(role="user", parts=[types.Part(text=message.content)])
+        
+        # Compact the history now; the model callback cannot await
+        await self._compact_history(session, adk_message)
+        
+        # Score the message against every agent now; the model callback cannot await
+        if len(self.remote_agents) > self.shortlist_size:
+            await self.agent_index.rank(message.content, self.shortlist_size)
         
         # Process message
         async for event in self.runner.run_async(
@@ -329,11 +872,37 @@ Current agent: {current_agent_str}
             if event.content and event.content.role == "model":
                 yield event.content.parts[0].text if event.content.parts else ""
     
-    async def create_task(self, message: Message) -> Task:
+    async def _compact_history(self, session, new_message: types.Content) -> None:
+        """Fold old turns into the running summary before a turn, if over budget.
+        
+        The history is rebuilt from the session events the way ADK builds the
+        contents of the model request for a single agent, so the number of
+        folded turns matches the contents the model callback sees.
+        
+        Args:
+            session: The ADK session of the conversation.
+            new_message: The user message starting the turn.
+        """
+        contents = [
+            event.content for event in session.events
+            if event.content and event.content.role and event.content.parts
+            and event.content.parts[0].text != ""
+        ]
+        
+        state_delta = await self.context_builder.compact(contents + [new_message], session.state)
+        if state_delta:
+            self.session_service.append_event(session, ADKEvent(
+                author=self.adk_agent.name,
+                actions=ADKEventActions(state_delta=state_delta)
+            ))
+    
+    async def create_task(self, message: Message, agent_id: Optional[str] = None) -> Task:
         """Create a task from a message.
         
         Args:
             message: The message to create a task from.
+            agent_id: The ID of the agent the message was routed to. The
+                message is routed if not given.
             
         Returns:
             The created task.
@@ -341,7 +910,7 @@ Current agent: {current_agent_str}
         # Create a new task
         task = Task(
             id=str(uuid.uuid4()),
-            agent_id=await self._get_agent_id_for_query(message.content),
+            agent_id=agent_id or await self._get_agent_id_for_query(message.content),
             message_id=message.id,
             session_id=message.conversation_id,
             state=TaskState.SUBMITTED,
@@ -435,6 +1004,53 @@ Current agent: {current_agent_str}
             tools_list=self.agent_config.get("tools", [])
         )
     
+    async def route_query(self, query: str) -> Optional[str]:
+        """Pick the remote agent that should handle a query.
+        
+        Args:
+            query: The query to route.
+            
+        Returns:
+            The name of the remote agent, or None if the host agent should handle it.
+        """
+        # Skip agents whose circuit is open
+        unavailable = {
+            name for name, agent in self.remote_agents.items()
+            if not agent.is_available
+        }
+        
+        try:
+            agent_name = await self.router.select(query, exclude=unavailable)
+        except Exception as e:
+            logger.error(f"Error routing query: {e}")
+            agent_name = None
+        
+        # Ignore agents unregistered while the query was being scored
+        if agent_name not in self.remote_agents:
+            agent_name = None
+        
+        # Use the fallback agent if it is an available remote agent
+        if agent_name is None:
+            fallback = self.routing_config.get("fallback_agent", "host_agent")
+            if fallback in self.remote_agents and fallback not in unavailable:
+                agent_name = fallback
+        
+        return agent_name
+    
+    def get_remote_agent_name(self, agent_id: str) -> Optional[str]:
+        """Get the name of a registered remote agent by ID.
+        
+        Args:
+            agent_id: The ID of the agent.
+            
+        Returns:
+            The name of the remote agent, or None if it is not registered.
+        """
+        for name, remote_agent_id in self.remote_agent_ids.items():
+            if remote_agent_id == agent_id:
+                return name
+        return None
+    
     async def _get_agent_id_for_query(self, query: str) -> str:
         """Get the agent ID for a query.
         
@@ -447,7 +1063,10 @@ Current agent: {current_agent_str}
         Returns:
             The ID of the agent to handle the query.
         """
-        # TODO: Implement agent selection logic
-        # For now, return the host agent ID
+        agent_name = await self.route_query(query)
+        if agent_name is not None:
+            return self.remote_agent_ids[agent_name]
+        
+        # Fall back to the host agent
         agent_model = await self.to_agent_model()
         return agent_model.id
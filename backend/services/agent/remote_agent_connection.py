@@ -1,5 +1,6 @@
 """Remote agent connection implementation for Deepdevflow."""
 
+import asyncio
 import json
 import uuid
 import logging
@@ -8,6 +9,15 @@ import httpx
 
 from backend.models import Task, TaskState
 from backend.utils.config import config
+from backend.utils.http_client import get_http_client, get_host_limit
+from .circuit_breaker import CircuitBreaker
+from .retry import (
+    RetryBudget,
+    decorrelated_jitter,
+    get_retry_after,
+    is_retryable_error,
+    is_retryable_status,
+)
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -41,12 +51,134 @@ class RemoteAgentConnection:
         self.timeout = connection_config.get("timeout", 30)
         self.retries = connection_config.get("retries", 3)
         self.retry_delay = connection_config.get("retry_delay", 1)
+        self.retry_max_delay = connection_config.get("retry_max_delay", 10)
+        self.health_check_timeout = connection_config.get("health_check_timeout", 5)
         
-        # Initialize client
-        self.client = httpx.AsyncClient(timeout=self.timeout)
+        # Initialize retry budget
+        budget_config = connection_config.get("retry_budget", {})
+        self.retry_budget = RetryBudget(
+            ratio=budget_config.get("ratio", 0.2),
+            max_tokens=budget_config.get("max_tokens", 10)
+        )
+        
+        # Initialize circuit breaker
+        breaker_config = connection_config.get("circuit_breaker", {})
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=breaker_config.get("failure_threshold", 3),
+            reset_timeout=breaker_config.get("reset_timeout", 30)
+        )
         
         # Initialize pending tasks
         self.pending_tasks = set()
+        
+        # Whether the agent has a streaming endpoint (None until known)
+        self.supports_streaming: Optional[bool] = None
+        
+        # Whether the agent has a batch status endpoint (None until known)
+        self.supports_batch_status: Optional[bool] = None
+    
+    @property
+    def is_available(self) -> bool:
+        """Whether requests to the agent are currently allowed by its circuit breaker."""
+        return not self.circuit_breaker.is_open
+    
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        idempotent: bool = True,
+        probe: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request to the remote agent over the shared client.
+        
+        The outcome is recorded in the circuit breaker: transport errors and
+        server errors count as failures. Probes are sent once and left for
+        the caller to record.
+        
+        Args:
+            method: The HTTP method.
+            path: The path relative to the agent URL.
+            idempotent: Whether repeating the request is harmless.
+            probe: Whether this is a health probe.
+            **kwargs: Additional request parameters.
+            
+        Returns:
+            The response.
+        """
+        if probe:
+            async with get_host_limit(self.url):
+                return await get_http_client().request(method, f"{self.url}{path}", **kwargs)
+        
+        try:
+            response = await self._request_with_retries(method, path, idempotent, **kwargs)
+        except httpx.HTTPError:
+            self.circuit_breaker.record_failure()
+            raise
+        
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+    
+    async def _request_with_retries(
+        self,
+        method: str,
+        path: str,
+        idempotent: bool,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures.
+        
+        Transient failures are retried up to ``retries`` times with
+        decorrelated jitter while the agent's retry budget allows.
+        Non-idempotent requests are only retried when the remote agent
+        cannot have processed them.
+        
+        Args:
+            method: The HTTP method.
+            path: The path relative to the agent URL.
+            idempotent: Whether repeating the request is harmless.
+            **kwargs: Additional request parameters.
+            
+        Returns:
+            The response.
+        """
+        self.retry_budget.deposit()
+        delay = self.retry_delay
+        attempt = 0
+        
+        while True:
+            response = None
+            try:
+                async with get_host_limit(self.url):
+                    response = await get_http_client().request(
+                        method, f"{self.url}{path}", **kwargs
+                    )
+                if not is_retryable_status(response.status_code, idempotent):
+                    return response
+            except httpx.HTTPError as e:
+                if not is_retryable_error(e, idempotent):
+                    raise
+                error = e
+            
+            # Give up when out of attempts or budget
+            if attempt >= self.retries or not self.retry_budget.withdraw():
+                if response is not None:
+                    return response
+                raise error
+            
+            attempt += 1
+            delay = decorrelated_jitter(delay, self.retry_delay, self.retry_max_delay)
+            wait = get_retry_after(response)
+            wait = min(self.retry_max_delay, wait) if wait is not None else delay
+            
+            logger.warning(
+                f"Retrying {method} {path} on remote agent {self.name} "
+                f"in {wait:.2f}s (attempt {attempt}/{self.retries})"
+            )
+            await asyncio.sleep(wait)
     
     async def send_task(self, task_params: Dict[str, Any]) -> Task:
         """Send a task to the remote agent.
@@ -59,15 +191,21 @@ class RemoteAgentConnection:
         """
         task_id = task_params.get("id", str(uuid.uuid4()))
         
+        # Fail fast while the circuit is open
+        if not self.circuit_breaker.allow_request():
+            logger.warning(f"Circuit open for remote agent {self.name}, not sending task {task_id}")
+            return self._create_error_task(task_id, task_params, "Circuit open")
+        
         # Store task ID in pending tasks
         self.pending_tasks.add(task_id)
         
         try:
             # Send task to remote agent
-            response = await self.client.post(
-                f"{self.url}/task/send",
-                json=task_params,
-                timeout=self.timeout
+            response = await self._request(
+                "POST",
+                "/task/send",
+                idempotent=False,
+                json=task_params
             )
             response.raise_for_status()
             
@@ -78,7 +216,7 @@ class RemoteAgentConnection:
             task = self._create_task_from_response(result, task_id, task_params)
             
             # Remove from pending tasks if completed
-            if task.status.state in [
+            if task.state in [
                 TaskState.COMPLETED,
                 TaskState.CANCELED,
                 TaskState.FAILED
@@ -86,6 +224,10 @@ class RemoteAgentConnection:
                 self.pending_tasks.remove(task_id)
             
             return task
+        except asyncio.CancelledError:
+            # Stop counting a task abandoned by the caller
+            self.pending_tasks.discard(task_id)
+            raise
         except Exception as e:
             logger.error(f"Error sending task to remote agent {self.name}: {e}")
             
@@ -94,19 +236,210 @@ class RemoteAgentConnection:
                 self.pending_tasks.remove(task_id)
             
             # Create error task
-            task = Task(
-                id=task_id,
-                agent_id="unknown",
-                message_id="unknown",
-                session_id=task_params.get("sessionId", "unknown"),
-                state=TaskState.FAILED,
-                metadata_json={
-                    "error": str(e),
-                    "agent": self.name
-                }
-            )
+            return self._create_error_task(task_id, task_params, str(e))
+    
+    def _create_error_task(
+        self,
+        task_id: str,
+        task_params: Dict[str, Any],
+        error: str
+    ) -> Task:
+        """Create a failed task for a task that could not be sent.
+        
+        Args:
+            task_id: The ID of the task.
+            task_params: The task parameters.
+            error: The error message.
             
-            return task
+        Returns:
+            The failed task.
+        """
+        return Task(
+            id=task_id,
+            agent_id="unknown",
+            message_id="unknown",
+            session_id=task_params.get("sessionId", "unknown"),
+            state=TaskState.FAILED,
+            metadata_json={
+                "error": error,
+                "agent": self.name
+            }
+        )
+    
+    async def send_task_streaming(
+        self,
+        task_params: Dict[str, Any]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Send a task to the remote agent and stream its updates.
+        
+        Uses the ``/task/sendSubscribe`` endpoint, which may answer with
+        server-sent events or newline-delimited JSON. Agents without the
+        endpoint are remembered and served by ``send_task`` instead.
+        
+        Args:
+            task_params: The task parameters to send.
+            
+        Yields:
+            Updates with the task "state", a status "message" text, an
+            "artifact" and whether the update is "final".
+        """
+        task_id = task_params.get("id", str(uuid.uuid4()))
+        
+        if self.supports_streaming is not False:
+            # Fail fast while the circuit is open
+            if not self.circuit_breaker.allow_request():
+                logger.warning(f"Circuit open for remote agent {self.name}, not sending task {task_id}")
+                yield self._create_update(TaskState.FAILED, message="Circuit open", final=True)
+                return
+            
+            self.pending_tasks.add(task_id)
+            
+            # Tasks still running when the stream ends stay pending so their status can be polled
+            still_running = False
+            try:
+                async with get_host_limit(self.url, streaming=True):
+                    async with get_http_client().stream(
+                        "POST",
+                        f"{self.url}/task/sendSubscribe",
+                        json=task_params
+                    ) as response:
+                        if response.status_code not in (404, 405, 501):
+                            response.raise_for_status()
+                            self.supports_streaming = True
+                            
+                            update = None
+                            async for payload in self._iter_payloads(response):
+                                update = self._parse_update(payload)
+                                yield update
+                                if update["final"]:
+                                    break
+                            
+                            still_running = update is not None and not update["final"]
+                self.circuit_breaker.record_success()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error(f"Error streaming task from remote agent {self.name}: {e}")
+                
+                # Client errors mean the agent is up; malformed payloads count as failures
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500:
+                    self.circuit_breaker.record_success()
+                else:
+                    self.circuit_breaker.record_failure()
+                yield self._create_update(TaskState.FAILED, message=str(e), final=True)
+                return
+            finally:
+                if not still_running:
+                    self.pending_tasks.discard(task_id)
+            
+            if self.supports_streaming:
+                return
+            
+            logger.info(f"Remote agent {self.name} does not support streaming, using /task/send")
+            self.supports_streaming = False
+        
+        # Fall back to a single blocking request
+        task = await self.send_task(task_params)
+        for artifact in task.artifacts_json:
+            yield self._create_update(task.state, artifact=artifact)
+        metadata = task.metadata_json
+        yield self._create_update(
+            task.state,
+            message=metadata.get("message") or metadata.get("error"),
+            final=task.state in [TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED]
+        )
+    
+    async def _iter_payloads(self, response: httpx.Response) -> AsyncGenerator[Dict[str, Any], None]:
+        """Parse a streaming response into JSON payloads.
+        
+        Args:
+            response: The streaming response, either SSE or NDJSON.
+            
+        Yields:
+            The decoded JSON payloads.
+        
+        Raises:
+            ValueError: If a payload is not a JSON object.
+        """
+        is_sse = response.headers.get("content-type", "").startswith("text/event-stream")
+        data_lines = []
+        
+        async for line in response.aiter_lines():
+            if not is_sse:
+                if line.strip():
+                    yield self._decode_payload(line)
+                continue
+            
+            # Server-sent events end with a blank line
+            if line.startswith("data:"):
+                data_lines.append(line[5:].strip())
+            elif not line.strip() and data_lines:
+                yield self._decode_payload("\n".join(data_lines))
+                data_lines = []
+        
+        if data_lines:
+            yield self._decode_payload("\n".join(data_lines))
+    
+    @staticmethod
+    def _decode_payload(data: str) -> Dict[str, Any]:
+        """Decode a streamed payload, which must be a JSON object."""
+        payload = json.loads(data)
+        if not isinstance(payload, dict):
+            raise ValueError(f"Expected a JSON object in the task stream, got {type(payload).__name__}")
+        return payload
+    
+    def _parse_update(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a streamed status or artifact event.
+        
+        Args:
+            payload: The decoded event, optionally wrapped in a JSON-RPC "result".
+            
+        Returns:
+            The normalized update.
+        """
+        if "error" in payload:
+            error = payload["error"]
+            message = error.get("message") if isinstance(error, dict) else str(error)
+            return self._create_update(TaskState.FAILED, message=message, final=True)
+        
+        event = payload.get("result", payload)
+        status = event.get("status") or {}
+        state = self._parse_task_state(status.get("state", "working"))
+        final = event.get("final", state in [
+            TaskState.COMPLETED,
+            TaskState.CANCELED,
+            TaskState.FAILED
+        ])
+        
+        return self._create_update(
+            state,
+            message=self._get_text(status.get("message")),
+            artifact=event.get("artifact"),
+            final=final
+        )
+    
+    @staticmethod
+    def _get_text(message: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Get the text of a message given as "content" or text "parts"."""
+        if not message:
+            return None
+        if message.get("content"):
+            return message["content"]
+        texts = [part.get("text", "") for part in message.get("parts", []) if part.get("text")]
+        return "".join(texts) or None
+    
+    @staticmethod
+    def _create_update(
+        state: TaskState,
+        message: Optional[str] = None,
+        artifact: Optional[Dict[str, Any]] = None,
+        final: bool = False
+    ) -> Dict[str, Any]:
+        """Create a normalized task update."""
+        return {
+            "state": state,
+            "message": message,
+            "artifact": artifact,
+            "final": final
+        }
     
     async def get_task_status(self, task_id: str) -> Optional[Task]:
         """Get the status of a task.
@@ -123,9 +456,9 @@ class RemoteAgentConnection:
                 return None
             
             # Send status request to remote agent
-            response = await self.client.get(
-                f"{self.url}/task/status/{task_id}",
-                timeout=self.timeout
+            response = await self._request(
+                "GET",
+                f"/task/status/{task_id}"
             )
             response.raise_for_status()
             
@@ -136,7 +469,7 @@ class RemoteAgentConnection:
             task = self._create_task_from_response(result, task_id)
             
             # Remove from pending tasks if completed
-            if task.status.state in [
+            if task.state in [
                 TaskState.COMPLETED,
                 TaskState.CANCELED,
                 TaskState.FAILED
@@ -148,6 +481,59 @@ class RemoteAgentConnection:
             logger.error(f"Error getting task status from remote agent {self.name}: {e}")
             return None
     
+    async def get_task_statuses(self, task_ids: List[str]) -> Dict[str, Task]:
+        """Get the status of several tasks.
+        
+        Uses the ``/task/status/batch`` endpoint when the agent has it and
+        falls back to concurrent single status requests otherwise.
+        
+        Args:
+            task_ids: The IDs of the tasks to get the status of.
+            
+        Returns:
+            The tasks found, by ID.
+        """
+        task_ids = [task_id for task_id in task_ids if task_id in self.pending_tasks]
+        
+        if len(task_ids) > 1 and self.supports_batch_status is not False:
+            try:
+                response = await self._request(
+                    "POST",
+                    "/task/status/batch",
+                    json={"ids": task_ids}
+                )
+                
+                if response.status_code in (404, 405, 501):
+                    logger.info(f"Remote agent {self.name} does not support batch status requests")
+                    self.supports_batch_status = False
+                else:
+                    response.raise_for_status()
+                    self.supports_batch_status = True
+                    
+                    tasks = {}
+                    for result in response.json().get("results", []):
+                        task_id = result.get("result", {}).get("id")
+                        if task_id in task_ids:
+                            tasks[task_id] = self._create_task_from_response(result, task_id)
+                    
+                    # Remove completed tasks from pending tasks
+                    for task_id, task in tasks.items():
+                        if task.state in [
+                            TaskState.COMPLETED,
+                            TaskState.CANCELED,
+                            TaskState.FAILED
+                        ]:
+                            self.pending_tasks.discard(task_id)
+                    
+                    return tasks
+            except Exception as e:
+                logger.error(f"Error getting task statuses from remote agent {self.name}: {e}")
+                return {}
+        
+        # Fall back to one request per task
+        tasks = await asyncio.gather(*[self.get_task_status(task_id) for task_id in task_ids])
+        return {task_id: task for task_id, task in zip(task_ids, tasks) if task}
+    
     async def cancel_task(self, task_id: str) -> Optional[Task]:
         """Cancel a task.
         
@@ -163,9 +549,9 @@ class RemoteAgentConnection:
                 return None
             
             # Send cancel request to remote agent
-            response = await self.client.post(
-                f"{self.url}/task/cancel/{task_id}",
-                timeout=self.timeout
+            response = await self._request(
+                "POST",
+                f"/task/cancel/{task_id}"
             )
             response.raise_for_status()
             
@@ -191,19 +577,29 @@ class RemoteAgentConnection:
         """
         try:
             # Send health check request to remote agent
-            response = await self.client.get(
-                f"{self.url}/health",
-                timeout=self.timeout
+            response = await self._request(
+                "GET",
+                "/health",
+                probe=True,
+                timeout=self.health_check_timeout
             )
             response.raise_for_status()
             
             # Check response
             result = response.json()
             
-            return result.get("status") == "ok"
+            healthy = result.get("status") == "ok"
         except Exception as e:
             logger.error(f"Error checking health of remote agent {self.name}: {e}")
-            return False
+            healthy = False
+        
+        # Update the circuit breaker
+        if healthy:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+        
+        return healthy
     
     def _create_task_from_response(
         self, 
@@ -231,6 +627,11 @@ class RemoteAgentConnection:
         if "error" in response:
             metadata["error"] = response["error"]
         
+        # Keep the status message text
+        status_message = self._get_text(task_data.get("status", {}).get("message"))
+        if status_message:
+            metadata["message"] = status_message
+        
         # Get session ID
         session_id = task_params.get("sessionId", "unknown") if task_params else "unknown"
         
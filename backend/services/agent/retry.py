@@ -0,0 +1,117 @@
+"""Retry helpers for remote agent connections in Deepdevflow."""
+
+import random
+from typing import Optional
+
+import httpx
+
+# Errors raised before the request reached the remote agent; safe to retry any request
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Errors after the request may have been processed; only safe for idempotent requests
+TRANSPORT_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.WriteError, httpx.RemoteProtocolError)
+
+# Statuses returned without processing the request
+REJECTED_STATUSES = {429, 503}
+
+# Statuses after which the request may have been processed
+GATEWAY_STATUSES = {502, 504}
+
+
+def is_retryable_error(error: Exception, idempotent: bool) -> bool:
+    """Check whether a failed request may be retried.
+    
+    Args:
+        error: The error raised by the request.
+        idempotent: Whether repeating the request is harmless.
+        
+    Returns:
+        True if the request may be retried, False otherwise.
+    """
+    if isinstance(error, CONNECT_ERRORS):
+        return True
+    return idempotent and isinstance(error, TRANSPORT_ERRORS)
+
+
+def is_retryable_status(status_code: int, idempotent: bool) -> bool:
+    """Check whether a response status may be retried.
+    
+    Args:
+        status_code: The HTTP status code of the response.
+        idempotent: Whether repeating the request is harmless.
+        
+    Returns:
+        True if the request may be retried, False otherwise.
+    """
+    if status_code in REJECTED_STATUSES:
+        return True
+    return idempotent and status_code in GATEWAY_STATUSES
+
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """Get the next retry delay using decorrelated jitter.
+    
+    Each delay is drawn between the base delay and three times the previous
+    one, which spreads retries from many clients apart while still backing off.
+    
+    Args:
+        previous: The previous delay in seconds.
+        base: The minimum delay in seconds.
+        cap: The maximum delay in seconds.
+        
+    Returns:
+        The next delay in seconds.
+    """
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+def get_retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Get the delay requested by a Retry-After header in seconds.
+    
+    Args:
+        response: The response, if any.
+        
+    Returns:
+        The requested delay, or None if absent or not in seconds.
+    """
+    if response is None:
+        return None
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a share of the request volume.
+    
+    Every request deposits ``ratio`` tokens and every retry withdraws one,
+    so once the initial tokens are spent retries cannot exceed ``ratio``
+    times the traffic and cannot amplify an outage.
+    """
+    
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10):
+        """Initialize the budget.
+        
+        Args:
+            ratio: Retries allowed per request.
+            max_tokens: Maximum number of retries that can be banked.
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+    
+    def deposit(self) -> None:
+        """Record a request."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+    
+    def withdraw(self) -> bool:
+        """Try to spend a token on a retry.
+        
+        Returns:
+            True if the retry is allowed, False if the budget is exhausted.
+        """
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
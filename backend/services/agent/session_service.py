@@ -0,0 +1,467 @@
+"""Database-backed ADK session service for Deepdevflow."""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from google.adk.events.event import Event as ADKEvent
+from google.adk.sessions import BaseSessionService, Session as ADKSession, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListEventsResponse,
+    ListSessionsResponse,
+)
+from sqlalchemy import delete, select, update
+
+from backend.models import AgentSession, AgentSessionEvent
+from backend.utils.database import get_session
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Key of a cached session: (app_name, user_id, session_id)
+SessionKey = Tuple[str, str, str]
+
+
+class SqlSessionService(BaseSessionService):
+    """ADK session service that stores sessions in the application database.
+    
+    Sessions and their events are persisted through the shared database
+    engine, so any worker can serve any conversation and nothing is lost on
+    restart. Recently used sessions are kept in an LRU cache and served from
+    memory; sessions idle for longer than ``idle_timeout`` and the least
+    recently used sessions beyond ``max_cached`` are evicted.
+    
+    Writes are queued and applied in order by a background writer in a
+    worker thread, so they never block the event loop. Sessions with queued
+    writes are not evicted, so a cache miss never reads a session older than
+    this worker's own writes. The ADK session API is synchronous, so reads
+    still run on the calling thread: a cache hit costs one primary key
+    lookup of the session's last update time, and a session that another
+    worker updated since it was cached is reloaded.
+    
+    Events are only ever appended, and each event's state delta is merged
+    into the stored state with a compare-and-set on the last update time,
+    so turns persisted concurrently by different workers are all kept.
+    """
+    
+    # Attempts to merge a state delta before giving up on a contended session
+    MERGE_ATTEMPTS = 5
+    
+    # Every write advances the stored update time, even for events older than
+    # the last one, so cached copies always notice writes from other workers
+    MIN_TIME_STEP = 1e-6
+    
+    def __init__(self, max_cached: int = 1000, idle_timeout: float = 1800):
+        """Initialize the session service.
+        
+        Args:
+            max_cached: Maximum number of sessions kept in memory.
+            idle_timeout: Seconds after which an unused session is evicted.
+        """
+        self.max_cached = max_cached
+        self.idle_timeout = idle_timeout
+        self._cache: "OrderedDict[SessionKey, Tuple[ADKSession, float]]" = OrderedDict()
+        
+        # Write-behind queue and the number of queued writes per session
+        self._writes: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._pending_writes: Dict[SessionKey, int] = {}
+        
+        # Sessions to reload once their queued writes have landed
+        self._stale: Set[SessionKey] = set()
+    
+    def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None
+    ) -> ADKSession:
+        """Create a new session.
+        
+        Args:
+            app_name: The name of the app.
+            user_id: The ID of the user.
+            state: The initial state of the session.
+            session_id: The ID of the session, generated if not given.
+        
+        Returns:
+            The created session.
+        """
+        session = ADKSession(
+            id=session_id or str(uuid.uuid4()),
+            app_name=app_name,
+            user_id=user_id,
+            state=state or {},
+            last_update_time=time.time()
+        )
+        
+        self._cache_session(session)
+        self._enqueue(session, self._write_session, session.id, app_name, user_id,
+                      json.dumps(session.state), session.last_update_time)
+        return session.model_copy(deep=True)
+    
+    def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None
+    ) -> Optional[ADKSession]:
+        """Get a session with its events.
+        
+        Args:
+            app_name: The name of the app.
+            user_id: The ID of the user.
+            session_id: The ID of the session.
+            config: Limits on the events returned.
+        
+        Returns:
+            The session, or None if it does not exist.
+        """
+        key = (app_name, user_id, session_id)
+        self._evict_idle()
+        
+        # Reload sessions updated by another worker since they were cached,
+        # unless this worker has writes queued that the database is behind on
+        cached = self._cache.get(key)
+        if (cached is not None and key not in self._pending_writes
+                and self._get_update_time(session_id) != cached[0].last_update_time):
+            cached = None
+        
+        if cached is not None:
+            session = cached[0]
+        else:
+            session = self._load_session(app_name, user_id, session_id)
+            if session is None:
+                self._cache.pop(key, None)
+                return None
+        
+        self._cache_session(session)
+        session = session.model_copy(deep=True)
+        
+        # Apply event limits
+        if config:
+            if config.num_recent_events:
+                session.events = session.events[-config.num_recent_events:]
+            if config.after_timestamp:
+                session.events = [e for e in session.events if e.timestamp > config.after_timestamp]
+        
+        return session
+    
+    def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        """List the sessions of a user without their events.
+        
+        Args:
+            app_name: The name of the app.
+            user_id: The ID of the user.
+        
+        Returns:
+            The sessions of the user.
+        """
+        with get_session() as db:
+            db_sessions = db.execute(
+                select(AgentSession).where(
+                    AgentSession.app_name == app_name,
+                    AgentSession.user_id == user_id
+                )
+            ).scalars().all()
+            
+            return ListSessionsResponse(sessions=[
+                ADKSession(
+                    id=db_session.id,
+                    app_name=app_name,
+                    user_id=user_id,
+                    state=db_session.state_json,
+                    last_update_time=db_session.last_update_time
+                )
+                for db_session in db_sessions
+            ])
+    
+    def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        """Delete a session and its events.
+        
+        Args:
+            app_name: The name of the app.
+            user_id: The ID of the user.
+            session_id: The ID of the session.
+        """
+        key = (app_name, user_id, session_id)
+        cached = self._cache.pop(key, None)
+        session = cached[0] if cached else ADKSession(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id
+        )
+        self._enqueue(session, self._delete_session, session_id, app_name, user_id)
+    
+    def list_events(self, *, app_name: str, user_id: str, session_id: str) -> ListEventsResponse:
+        """List the events of a session.
+        
+        Args:
+            app_name: The name of the app.
+            user_id: The ID of the user.
+            session_id: The ID of the session.
+        
+        Returns:
+            The events of the session.
+        """
+        session = self.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        return ListEventsResponse(events=session.events if session else [])
+    
+    def append_event(self, session: ADKSession, event: ADKEvent) -> ADKEvent:
+        """Append an event to a session and queue it to be persisted.
+        
+        Args:
+            session: The session to append to.
+            event: The event to append.
+        
+        Returns:
+            The appended event.
+        """
+        if event.partial:
+            return event
+        
+        # Apply the state delta to the session and add the event
+        previous_update_time = session.last_update_time
+        super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        
+        # Persist the delta rather than the whole state, so it can be merged
+        state_delta = {
+            name: value for name, value in (event.actions.state_delta or {}).items()
+            if not name.startswith(State.TEMP_PREFIX)
+        }
+        
+        self._cache_session(session)
+        self._enqueue(session, self._write_event, session.id, json.dumps(state_delta),
+                      previous_update_time, event.timestamp,
+                      event.model_dump_json(exclude_none=True))
+        return event
+    
+    async def close(self) -> None:
+        """Apply the queued writes and stop the background writer."""
+        if self._writes is not None:
+            await self._writes.join()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        self._writes = None
+    
+    def _load_session(self, app_name: str, user_id: str, session_id: str) -> Optional[ADKSession]:
+        """Load a session and its events from the database."""
+        with get_session() as db:
+            db_session = db.execute(
+                select(AgentSession).where(
+                    AgentSession.id == session_id,
+                    AgentSession.app_name == app_name,
+                    AgentSession.user_id == user_id
+                )
+            ).scalars().first()
+            
+            if db_session is None:
+                return None
+            
+            events = db.execute(
+                select(AgentSessionEvent.event_data)
+                .where(AgentSessionEvent.session_id == session_id)
+                .order_by(AgentSessionEvent.timestamp)
+            ).scalars().all()
+            
+            return ADKSession(
+                id=session_id,
+                app_name=app_name,
+                user_id=user_id,
+                state=db_session.state_json,
+                events=[ADKEvent.model_validate_json(data) for data in events],
+                last_update_time=db_session.last_update_time
+            )
+    
+    def _get_update_time(self, session_id: str) -> Optional[float]:
+        """Get the last update time of a stored session, or None if it does not exist."""
+        with get_session() as db:
+            return db.execute(
+                select(AgentSession.last_update_time).where(AgentSession.id == session_id)
+            ).scalar()
+    
+    def _enqueue(self, session: ADKSession, write: Callable[..., bool], *args: Any) -> None:
+        """Queue a database write of a session for the background writer.
+        
+        Without a running event loop the write is applied immediately.
+        """
+        key = (session.app_name, session.user_id, session.id)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self._apply(key, write, args):
+                self._cache.pop(key, None)
+            return
+        
+        if self._writes is None:
+            self._writes = asyncio.Queue()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_loop())
+        
+        self._pending_writes[key] = self._pending_writes.get(key, 0) + 1
+        self._writes.put_nowait((key, write, args))
+    
+    async def _write_loop(self) -> None:
+        """Apply queued writes in order, off the event loop."""
+        while True:
+            key, write, args = await self._writes.get()
+            try:
+                if await asyncio.to_thread(self._apply, key, write, args):
+                    self._stale.add(key)
+            finally:
+                self._pending_writes[key] -= 1
+                if not self._pending_writes[key]:
+                    del self._pending_writes[key]
+                    
+                    # Evict stale sessions only now, so a reload includes every queued write
+                    if key in self._stale:
+                        self._stale.discard(key)
+                        self._cache.pop(key, None)
+                self._writes.task_done()
+    
+    def _apply(self, key: SessionKey, write: Callable[..., bool], args: Tuple[Any, ...]) -> bool:
+        """Apply one database write, logging failures.
+        
+        Returns:
+            True if the cached session is stale and must be evicted.
+        """
+        try:
+            return write(key, *args)
+        except Exception as e:
+            logger.error(f"Failed to persist agent session {key[2]}: {e}")
+            return True
+    
+    def _write_session(
+        self,
+        key: SessionKey,
+        session_id: str,
+        app_name: str,
+        user_id: str,
+        state: str,
+        last_update_time: float
+    ) -> bool:
+        """Insert a new session row."""
+        with get_session() as db:
+            db.add(AgentSession(
+                id=session_id,
+                app_name=app_name,
+                user_id=user_id,
+                state=state,
+                last_update_time=last_update_time
+            ))
+            db.commit()
+        return False
+    
+    def _write_event(
+        self,
+        key: SessionKey,
+        session_id: str,
+        state_delta: str,
+        previous_update_time: float,
+        timestamp: float,
+        event_data: str
+    ) -> bool:
+        """Insert an event row and merge its state delta into its session.
+        
+        Returns:
+            True if another worker wrote to the session since it was cached here.
+        """
+        delta = json.loads(state_delta)
+        
+        with get_session() as db:
+            for _ in range(self.MERGE_ATTEMPTS):
+                row = db.execute(
+                    select(AgentSession.state, AgentSession.last_update_time)
+                    .where(AgentSession.id == session_id)
+                ).first()
+                if row is None:
+                    raise ValueError(f"Session {session_id} not found")
+                
+                # Only update the row if no other write landed since it was read
+                state = {**(json.loads(row.state) if row.state else {}), **delta}
+                result = db.execute(
+                    update(AgentSession)
+                    .where(
+                        AgentSession.id == session_id,
+                        AgentSession.last_update_time == row.last_update_time
+                    )
+                    .values(
+                        state=json.dumps(state),
+                        last_update_time=max(timestamp, row.last_update_time + self.MIN_TIME_STEP)
+                    )
+                )
+                if result.rowcount:
+                    break
+                db.rollback()
+            else:
+                raise RuntimeError(f"Session {session_id} kept changing while merging an event")
+            
+            db.add(AgentSessionEvent(
+                session_id=session_id,
+                timestamp=timestamp,
+                event_data=event_data
+            ))
+            db.commit()
+        
+        stale = row.last_update_time != previous_update_time
+        if stale:
+            logger.warning(f"Agent session {session_id} was updated elsewhere, merged the event into it")
+        return stale
+    
+    def _delete_session(self, key: SessionKey, session_id: str, app_name: str, user_id: str) -> bool:
+        """Delete a session row and its events."""
+        with get_session() as db:
+            owned = db.execute(
+                select(AgentSession.id).where(
+                    AgentSession.id == session_id,
+                    AgentSession.app_name == app_name,
+                    AgentSession.user_id == user_id
+                )
+            ).first()
+            
+            if owned is not None:
+                db.execute(delete(AgentSessionEvent).where(AgentSessionEvent.session_id == session_id))
+                db.execute(delete(AgentSession).where(AgentSession.id == session_id))
+                db.commit()
+        return True
+    
+    def _cache_session(self, session: ADKSession) -> None:
+        """Add a session to the cache as the most recently used."""
+        key = (session.app_name, session.user_id, session.id)
+        self._cache[key] = (session, time.monotonic())
+        self._cache.move_to_end(key)
+        
+        # Evict the least recently used sessions without queued writes
+        excess = len(self._cache) - self.max_cached
+        for old_key in list(self._cache):
+            if excess <= 0:
+                break
+            if old_key != key and old_key not in self._pending_writes:
+                del self._cache[old_key]
+                excess -= 1
+    
+    def _evict_idle(self) -> None:
+        """Evict the sessions that have not been used within the idle timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        
+        # The cache is ordered by last use, so idle sessions are at the front
+        for key, (_, last_used) in list(self._cache.items()):
+            if last_used > cutoff:
+                break
+            if key not in self._pending_writes:
+                del self._cache[key]
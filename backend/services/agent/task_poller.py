@@ -0,0 +1,269 @@
+"""Shared status poller for remote agent tasks in Deepdevflow."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from backend.models import TaskState
+from .remote_agent_connection import RemoteAgentConnection
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# States after which a task is no longer polled
+TERMINAL_STATES = [TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED]
+
+
+@dataclass
+class TrackedTask:
+    """A remote task followed by the poller."""
+    
+    task_id: str
+    agent: RemoteAgentConnection
+    state: TaskState
+    interval: float
+    started_at: float
+    due: float = 0.0
+    message: Optional[str] = None
+    artifacts: List[Dict[str, Any]] = field(default_factory=list)
+    watchers: List[asyncio.Queue] = field(default_factory=list)
+
+
+class TaskPoller:
+    """Polls every non-terminal remote task from one background loop.
+    
+    Tasks are kept in a heap ordered by their next poll deadline. Tasks due
+    together are grouped per agent so each agent receives one batched status
+    request. A task's interval grows by ``backoff`` each time it is polled
+    without changes or its status cannot be read, up to ``max_interval``,
+    and is reset when it changes.
+    Updates are pushed to the queues of everyone watching the task.
+    """
+    
+    def __init__(
+        self,
+        min_interval: float = 1,
+        max_interval: float = 30,
+        backoff: float = 1.5,
+        max_age: float = 3600
+    ):
+        """Initialize the poller.
+        
+        Args:
+            min_interval: Seconds before the first poll and after a change.
+            max_interval: Maximum seconds between polls of an unchanged task.
+            backoff: Factor applied to the interval after an unchanged poll.
+            max_age: Seconds after which a task is given up on.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_age = max_age
+        self._tasks: Dict[str, TrackedTask] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+    
+    def track(self, agent: RemoteAgentConnection, task_id: str, state: TaskState) -> None:
+        """Start following a task until it reaches a terminal state.
+        
+        Args:
+            agent: The agent running the task.
+            task_id: The ID of the task.
+            state: The last known state of the task.
+        """
+        if state in TERMINAL_STATES or task_id in self._tasks:
+            return
+        
+        # Status lookups only cover tasks the agent still counts as pending
+        agent.pending_tasks.add(task_id)
+        
+        now = time.monotonic()
+        tracked = TrackedTask(
+            task_id=task_id,
+            agent=agent,
+            state=state,
+            interval=self.min_interval,
+            started_at=now
+        )
+        self._tasks[task_id] = tracked
+        self._schedule(tracked, now + self.min_interval)
+        self._start()
+    
+    def get_state(self, task_id: str) -> Optional[TaskState]:
+        """Get the last known state of a tracked task.
+        
+        Args:
+            task_id: The ID of the task.
+        
+        Returns:
+            The state, or None if the task is not tracked.
+        """
+        tracked = self._tasks.get(task_id)
+        return tracked.state if tracked else None
+    
+    async def watch(self, task_id: str) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream the updates of a tracked task until it finishes.
+        
+        Args:
+            task_id: The ID of the task.
+        
+        Yields:
+            Updates with the task "state", a status "message", its "artifacts"
+            and whether it is "final".
+        """
+        tracked = self._tasks.get(task_id)
+        if tracked is None:
+            return
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        tracked.watchers.append(queue)
+        try:
+            while True:
+                update = await queue.get()
+                yield update
+                if update["final"]:
+                    return
+        finally:
+            if queue in tracked.watchers:
+                tracked.watchers.remove(queue)
+    
+    def untrack_agent(self, agent: RemoteAgentConnection) -> None:
+        """Stop following the tasks of an agent, e.g. when it is unregistered.
+        
+        Args:
+            agent: The agent whose tasks are dropped.
+        """
+        for task_id in [t.task_id for t in self._tasks.values() if t.agent is agent]:
+            agent.pending_tasks.discard(task_id)
+            self._finish(task_id, TaskState.UNKNOWN)
+    
+    async def stop(self) -> None:
+        """Stop polling and release all watchers."""
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        
+        for task_id in list(self._tasks):
+            self._finish(task_id, TaskState.UNKNOWN)
+        self._heap.clear()
+    
+    def _start(self) -> None:
+        """Start the polling loop if it is not running."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+    
+    def _schedule(self, tracked: TrackedTask, due: float) -> None:
+        """Schedule the next poll of a task."""
+        tracked.due = due
+        heapq.heappush(self._heap, (due, next(self._counter), tracked.task_id))
+    
+    def _pop_due(self, now: float) -> List[TrackedTask]:
+        """Pop the tasks whose deadline has passed, skipping stale heap entries."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, task_id = heapq.heappop(self._heap)
+            tracked = self._tasks.get(task_id)
+            if tracked is not None and tracked.due == deadline:
+                due.append(tracked)
+        return due
+    
+    async def _run(self) -> None:
+        """Poll tasks as their deadlines come up."""
+        while True:
+            try:
+                # Sleep until the earliest deadline or until a task is added
+                self._wakeup.clear()
+                timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                if timeout is None or timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                
+                # Batch the due tasks per agent
+                by_agent: Dict[RemoteAgentConnection, List[TrackedTask]] = defaultdict(list)
+                for tracked in self._pop_due(time.monotonic()):
+                    by_agent[tracked.agent].append(tracked)
+                
+                await asyncio.gather(*[
+                    self._poll_agent(agent, tracked_tasks)
+                    for agent, tracked_tasks in by_agent.items()
+                ])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error polling remote tasks: {e}")
+    
+    async def _poll_agent(self, agent: RemoteAgentConnection, tracked_tasks: List[TrackedTask]) -> None:
+        """Poll the due tasks of one agent and publish their changes."""
+        try:
+            tasks = await agent.get_task_statuses([t.task_id for t in tracked_tasks])
+        except Exception as e:
+            logger.error(f"Error polling tasks of remote agent {agent.name}: {e}")
+            tasks = {}
+        
+        now = time.monotonic()
+        for tracked in tracked_tasks:
+            # Skip tasks dropped while their status was requested
+            if self._tasks.get(tracked.task_id) is not tracked:
+                continue
+            
+            task = tasks.get(tracked.task_id)
+            message = task.metadata_json.get("message") if task is not None else None
+            
+            if task is not None and (task.state != tracked.state or message != tracked.message):
+                tracked.state = task.state
+                tracked.message = message
+                tracked.artifacts = task.artifacts_json
+                tracked.interval = self.min_interval
+                
+                if task.state in TERMINAL_STATES:
+                    self._finish(tracked.task_id, task.state)
+                    continue
+                self._publish(tracked, final=False)
+            else:
+                # Back off unchanged tasks and tasks whose status could not be read
+                tracked.interval = min(self.max_interval, tracked.interval * self.backoff)
+            
+            # Give up on tasks that never finish
+            if now - tracked.started_at > self.max_age:
+                logger.warning(f"Giving up on remote task {tracked.task_id} after {self.max_age}s")
+                agent.pending_tasks.discard(tracked.task_id)
+                self._finish(tracked.task_id, TaskState.UNKNOWN)
+                continue
+            
+            self._schedule(tracked, now + tracked.interval)
+    
+    def _publish(self, tracked: TrackedTask, final: bool) -> None:
+        """Push the current state of a task to its watchers."""
+        update = {
+            "state": tracked.state,
+            "message": tracked.message,
+            "artifacts": tracked.artifacts,
+            "final": final
+        }
+        for queue in tracked.watchers:
+            queue.put_nowait(update)
+    
+    def _finish(self, task_id: str, state: TaskState) -> None:
+        """Stop tracking a task and send the final update to its watchers."""
+        tracked = self._tasks.pop(task_id, None)
+        if tracked is not None:
+            tracked.state = state
+            self._publish(tracked, final=True)
@@ -4,12 +4,13 @@ import logging
 from typing import Any, Dict, List, Optional, Union, AsyncGenerator
 import uuid
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session as DBSession
 
 from backend.models import Agent as AgentModel, Task, Message, TaskState
 from backend.utils.config import config
-from backend.utils.database import get_session
-from backend.services.agent import Agent, HostAgent, RemoteAgentConnection
+from backend.utils.database import get_session, get_async_session_factory
+from backend.services.agent import Agent, HostAgent, RemoteAgentConnection, HealthMonitor
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -42,6 +43,13 @@ class AgentService:
         
         # Load registered agents from database
         self._load_agents_from_db()
+        
+        # Create health monitor for remote agents
+        connection_config = config.get_agent_config("connection")
+        self._health_monitor = HealthMonitor(
+            lambda: self._host_agent.remote_agents.values(),
+            interval=connection_config.get("check_interval", 5)
+        )
     
     async def _register_host_agent(self):
         """Register host agent as a managed agent."""
@@ -89,6 +97,29 @@ class AgentService:
             # Clear pending agents
             delattr(self, '_pending_db_agents')
     
+    async def start_health_monitor(self):
+        """Start probing remote agents in the background if enabled."""
+        if not config.get_agent_config("connection").get("health_check_enabled", False):
+            return
+        
+        # Ensure DB agents are registered so they are probed too
+        if hasattr(self, '_pending_db_agents'):
+            await self._register_db_agents()
+        
+        self._health_monitor.start()
+    
+    async def stop_health_monitor(self):
+        """Stop probing remote agents."""
+        await self._health_monitor.stop()
+    
+    async def stop_task_poller(self):
+        """Stop polling unfinished remote tasks."""
+        await self._host_agent.task_poller.stop()
+    
+    async def stop_session_service(self):
+        """Persist the queued agent session writes."""
+        await self._host_agent.session_service.close()
+    
     async def get_agent(self, agent_id: str) -> Optional[Agent]:
         """Get an agent by ID.
         
@@ -116,8 +147,8 @@ class AgentService:
         
         # Get agent from database
         try:
-            with get_session() as db:
-                agent_model = db.query(AgentModel).filter(AgentModel.id == agent_id).first()
+            async with get_async_session_factory()() as db:
+                agent_model = await db.get(AgentModel, agent_id)
                 
                 if agent_model:
                     # Register with host agent if remote
@@ -152,9 +183,12 @@ class AgentService:
         
         try:
             # Save to database
-            with get_session() as db:
+            async with get_async_session_factory()() as db:
                 # Check if agent already exists
-                existing = db.query(AgentModel).filter(AgentModel.name == agent_model.name).first()
+                result = await db.execute(
+                    select(AgentModel).where(AgentModel.name == agent_model.name)
+                )
+                existing = result.scalars().first()
                 
                 if existing:
                     # Update existing agent
@@ -163,15 +197,15 @@ class AgentService:
                             setattr(existing, key, value)
                     
                     # Save changes
-                    db.commit()
+                    await db.commit()
                     
                     # Get updated model
                     agent_model = existing
                 else:
-                    # Add new agent
-                    db.add(agent_model)
-                    db.commit()
-                    db.refresh(agent_model)
+                    # Add new agent (merge, as it may belong to the caller's session)
+                    agent_model = await db.merge(agent_model)
+                    await db.commit()
+                    await db.refresh(agent_model)
             
             # Register with host agent if remote
             if agent_model.is_remote:
@@ -201,15 +235,18 @@ class AgentService:
         
         try:
             # Update database
-            with get_session() as db:
-                agent_model = db.query(AgentModel).filter(AgentModel.id == agent_id).first()
+            async with get_async_session_factory()() as db:
+                agent_model = await db.get(AgentModel, agent_id)
                 
                 if agent_model:
                     # Mark as inactive
                     agent_model.is_active = False
                     
                     # Save changes
-                    db.commit()
+                    await db.commit()
+                    
+                    # Stop routing to the agent
+                    await self._host_agent.unregister_remote_agent(agent_model.name)
                 
                     logger.info(f"Unregistered agent: {agent_model.name}")
                     return True
@@ -234,8 +271,11 @@ class AgentService:
             await self._register_db_agents()
             
         try:
-            with get_session() as db:
-                return db.query(AgentModel).filter(AgentModel.is_active == True).all()
+            async with get_async_session_factory()() as db:
+                result = await db.execute(
+                    select(AgentModel).where(AgentModel.is_active == True)
+                )
+                return result.scalars().all()
         except Exception as e:
             logger.error(f"Failed to list agents: {e}")
             return []
@@ -259,17 +299,24 @@ class AgentService:
             yield "Sorry, no agent is available to process your message."
             return
         
-        # Create a task for this message
-        task = await agent.create_task(message)
+        # Create a task for this message, reusing the routing decision
+        task = await agent.create_task(message, agent_id=agent_id)
         
         # Save task to database
         try:
-            with get_session() as db:
+            async with get_async_session_factory()() as db:
                 db.add(task)
-                db.commit()
+                await db.commit()
         except Exception as e:
             logger.error(f"Failed to save task: {e}")
         
+        # Send routed messages straight to the remote agent
+        remote_agent_name = self._host_agent.get_remote_agent_name(agent_id)
+        if remote_agent_name is not None:
+            async for chunk in self._host_agent.delegate_message(remote_agent_name, message):
+                yield chunk
+            return
+        
         # Process the message
         async for chunk in agent.process_message(message):
             yield chunk
@@ -283,10 +330,17 @@ class AgentService:
         Returns:
             The ID of the agent to route the message to.
         """
-        # TODO: Implement sophisticated routing logic
-        # For now, just return the host agent
-        host_agent_model = await self._host_agent.to_agent_model()
-        return host_agent_model.id
+        # Ensure DB agents are in the routing table
+        if hasattr(self, '_pending_db_agents'):
+            await self._register_db_agents()
+        
+        agent_name = await self._host_agent.route_query(message.content)
+        if agent_name is not None:
+            return self._host_agent.remote_agent_ids[agent_name]
+        
+        # Fall back to the host agent
+        agent_model = await self._host_agent.to_agent_model()
+        return agent_model.id
 
 
 # Create a singleton instance
@@ -2,8 +2,14 @@
 
 from .base import LLMProvider
 from .openai_provider import OpenAIProvider
+from .cache import ResponseCache
+from .coalescer import RequestCoalescer
+from .embedding_cache import EmbeddingCache
 
 __all__ = [
     "LLMProvider",
     "OpenAIProvider",
+    "ResponseCache",
+    "RequestCoalescer",
+    "EmbeddingCache",
 ]
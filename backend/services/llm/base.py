@@ -79,3 +79,18 @@ class LLMProvider(ABC):
             The embedding as a list of floats.
         """
         pass
+    
+    async def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Get embeddings for a batch of texts.
+        
+        Providers with a native batch API should override this; the default
+        embeds each text separately.
+        
+        Args:
+            texts: The texts to get embeddings for.
+            **kwargs: Additional provider-specific parameters.
+            
+        Returns:
+            One embedding per text, in input order.
+        """
+        return [await self.get_embedding(text, **kwargs) for text in texts]
@@ -0,0 +1,125 @@
+"""LLM response cache implementation for Deepdevflow."""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ResponseCache:
+    """Bounded exact-match cache with LRU eviction and TTL expiry."""
+    
+    def __init__(self, max_size: int = 10000, ttl: float = 3600):
+        """Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted.
+            ttl: Time-to-live of an entry in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: Optional[str],
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any]
+    ) -> str:
+        """Build a cache key for a request.
+        
+        Args:
+            provider: The provider name.
+            model: The model name.
+            messages: The request messages.
+            params: The sampling and other request parameters.
+        
+        Returns:
+            A hex digest identifying the request.
+        """
+        # Only role and content affect the response; strip surrounding whitespace
+        normalized = [
+            {"role": m.get("role"), "content": (m.get("content") or "").strip()}
+            for m in messages
+        ]
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "messages": normalized,
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            The cached value, or None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        # Mark as most recently used
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value.
+        
+        Args:
+            key: The cache key.
+            value: The value to store.
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        
+        # Evict least recently used entries
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+        
+        Returns:
+            A dictionary with size, hit, miss and eviction counts.
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+    
+    def __len__(self) -> int:
+        """Get the number of entries."""
+        return len(self._entries)
@@ -0,0 +1,158 @@
+"""Request coalescing implementation for Deepdevflow."""
+
+import asyncio
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+class StreamFanout:
+    """Shares one upstream stream with every subscriber.
+    
+    Chunks are buffered so subscribers that join while the stream is in
+    flight still receive the full response from the first chunk.
+    """
+    
+    def __init__(self, source: AsyncIterator[str], on_close: Callable[[], None]):
+        """Start consuming the upstream stream.
+        
+        Args:
+            source: The upstream stream of chunks.
+            on_close: Called once the fan-out stops accepting subscribers.
+        """
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._on_close = on_close
+        self._condition = asyncio.Condition()
+        self._task = asyncio.ensure_future(self._pump(source))
+    
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        """Read the upstream stream into the shared buffer."""
+        try:
+            async for chunk in source:
+                async with self._condition:
+                    self.chunks.append(chunk)
+                    self._condition.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._on_close()
+            async with self._condition:
+                self.done = True
+                self._condition.notify_all()
+    
+    async def subscribe(self) -> AsyncGenerator[str, None]:
+        """Stream every chunk of the shared response.
+        
+        Yields:
+            Chunks of the response, starting from the first one.
+        
+        Raises:
+            Exception: The upstream error, if the stream failed.
+        """
+        self.subscribers += 1
+        position = 0
+        
+        try:
+            while True:
+                async with self._condition:
+                    await self._condition.wait_for(
+                        lambda: position < len(self.chunks) or self.done
+                    )
+                    pending = self.chunks[position:]
+                    done = self.done
+                
+                for chunk in pending:
+                    yield chunk
+                position += len(pending)
+                
+                if done and position >= len(self.chunks):
+                    if self.error is not None:
+                        raise self.error
+                    return
+        finally:
+            self.subscribers -= 1
+            
+            # Stop the upstream call once nobody is listening anymore
+            if self.subscribers == 0 and not self.done:
+                self._on_close()
+                self._task.cancel()
+
+
+class RequestCoalescer:
+    """Coalesces identical in-flight requests into one upstream call."""
+    
+    def __init__(self):
+        """Initialize the coalescer."""
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._streams: Dict[str, StreamFanout] = {}
+        
+        # Counters
+        self.coalesced = 0
+    
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a call, sharing the result with identical concurrent calls.
+        
+        Args:
+            key: The request key.
+            call: Factory for the upstream call, invoked only by the first caller.
+        
+        Returns:
+            The result of the shared upstream call.
+        """
+        future = self._calls.get(key)
+        
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(self._calls, key, f))
+        else:
+            self.coalesced += 1
+        
+        # Shield so that one cancelled caller does not cancel the others
+        return await asyncio.shield(future)
+    
+    async def stream(
+        self,
+        key: str,
+        call: Callable[[], AsyncIterator[str]]
+    ) -> AsyncGenerator[str, None]:
+        """Stream a call, fanning one upstream stream out to identical concurrent calls.
+        
+        Args:
+            key: The request key.
+            call: Factory for the upstream stream, invoked only by the first caller.
+        
+        Yields:
+            Chunks of the shared response.
+        """
+        fanout = self._streams.get(key)
+        
+        if fanout is None:
+            fanout = StreamFanout(
+                call(),
+                on_close=lambda: self._forget(self._streams, key, fanout)
+            )
+            self._streams[key] = fanout
+        else:
+            self.coalesced += 1
+        
+        async for chunk in fanout.subscribe():
+            yield chunk
+    
+    @staticmethod
+    def _forget(registry: Dict[str, Any], key: str, value: Any) -> None:
+        """Remove a finished call from a registry if it is still the current one."""
+        if registry.get(key) is value:
+            del registry[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing statistics.
+        
+        Returns:
+            A dictionary with in-flight and coalesced request counts.
+        """
+        return {
+            "in_flight": len(self._calls) + len(self._streams),
+            "coalesced": self.coalesced,
+        }
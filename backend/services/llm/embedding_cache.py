@@ -0,0 +1,237 @@
+"""Persistent embedding cache implementation for Deepdevflow."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Content-addressed on-disk embedding cache.
+    
+    Vectors live in a memory-mapped float32 matrix with one row ("slot") per
+    entry. A small SQLite index maps (model, sha256(text)) to a slot, the
+    CRC of the stored vector and the last access time. Both files can be
+    shared by several processes: writers serialize on the index with
+    ``BEGIN IMMEDIATE`` and readers validate the CRC of every row they
+    copy, so a slot reused concurrently by another process reads as a miss.
+    When full, the least recently used entries are evicted.
+    """
+    
+    def __init__(self, path: str, dimensions: int, max_entries: int = 50000):
+        """Open or create the cache files.
+        
+        Args:
+            path: Directory holding the cache files.
+            dimensions: Embedding dimensions stored in this cache.
+            max_entries: Maximum number of cached embeddings.
+        """
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        os.makedirs(path, exist_ok=True)
+        
+        # Create the vector file without truncating one opened by another worker;
+        # numpy grows it to the full size on first map
+        vectors_path = os.path.join(path, f"vectors_{dimensions}.f32")
+        open(vectors_path, "ab").close()
+        self._vectors = np.memmap(
+            vectors_path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(max_entries, dimensions)
+        )
+        
+        # Open the index
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(
+            os.path.join(path, f"index_{dimensions}.sqlite"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("PRAGMA synchronous=NORMAL")
+        self._index.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "model TEXT NOT NULL, "
+            "text_hash BLOB NOT NULL, "
+            "slot INTEGER NOT NULL UNIQUE, "
+            "crc INTEGER NOT NULL, "
+            "last_used REAL NOT NULL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+        self._index.execute(
+            "CREATE INDEX IF NOT EXISTS ix_entries_last_used ON entries (last_used)"
+        )
+        
+        # Drop entries that no longer fit if max_entries was lowered
+        self._index.execute("DELETE FROM entries WHERE slot >= ?", (max_entries,))
+    
+    @staticmethod
+    def _hash(text: str) -> bytes:
+        """Get the content hash of a text."""
+        return hashlib.sha256(text.encode("utf-8")).digest()
+    
+    @staticmethod
+    def _checksum(vector: np.ndarray) -> int:
+        """Get the checksum of a stored vector."""
+        return zlib.crc32(np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+    
+    def get_many(self, model: str, texts: Sequence[str]) -> Dict[int, np.ndarray]:
+        """Look up cached embeddings.
+        
+        Args:
+            model: The embedding model name.
+            texts: The texts to look up.
+        
+        Returns:
+            A mapping from input position to embedding for every cache hit.
+        """
+        if not texts:
+            return {}
+        
+        hashes = [self._hash(text) for text in texts]
+        unique_hashes = list(dict.fromkeys(hashes))
+        rows = {}
+        
+        with self._lock:
+            # Chunk the IN clause to stay below SQLite's variable limit
+            for start in range(0, len(unique_hashes), 500):
+                chunk = unique_hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for text_hash, slot, crc in self._index.execute(
+                    f"SELECT text_hash, slot, crc FROM entries "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk]
+                ):
+                    rows[text_hash] = (slot, crc)
+        
+        # Copy rows out of the map, skipping slots rewritten since the lookup
+        vectors = {}
+        for text_hash, (slot, crc) in rows.items():
+            vector = np.array(self._vectors[slot])
+            if self._checksum(vector) == crc:
+                vectors[text_hash] = vector
+        
+        # Record access for LRU eviction (best effort)
+        if vectors:
+            now = time.time()
+            try:
+                with self._lock:
+                    self._index.executemany(
+                        "UPDATE entries SET last_used = ? WHERE model = ? AND text_hash = ?",
+                        [(now, model, text_hash) for text_hash in vectors]
+                    )
+            except sqlite3.OperationalError as e:
+                logger.debug(f"Failed to update embedding cache access times: {e}")
+        
+        return {
+            position: vectors[text_hash]
+            for position, text_hash in enumerate(hashes)
+            if text_hash in vectors
+        }
+    
+    def put_many(self, model: str, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Store embeddings, evicting the least recently used entries if full.
+        
+        Args:
+            model: The embedding model name.
+            texts: The embedded texts.
+            vectors: The embeddings, one row per text.
+        """
+        if len(texts) == 0:
+            return
+        
+        if vectors.shape[1] != self.dimensions:
+            logger.warning(
+                f"Not caching {vectors.shape[1]}-dimensional embeddings "
+                f"in a {self.dimensions}-dimensional cache"
+            )
+            return
+        
+        # Deduplicate, keeping the last vector for each text
+        entries = {self._hash(text): vectors[i] for i, text in enumerate(texts)}
+        entries = dict(list(entries.items())[-self.max_entries:])
+        now = time.time()
+        
+        with self._lock:
+            self._index.execute("BEGIN IMMEDIATE")
+            try:
+                # Skip entries another worker already stored
+                hashes = list(entries)
+                for start in range(0, len(hashes), 500):
+                    chunk = hashes[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    for (text_hash,) in self._index.execute(
+                        f"SELECT text_hash FROM entries "
+                        f"WHERE model = ? AND text_hash IN ({placeholders})",
+                        [model, *chunk]
+                    ).fetchall():
+                        entries.pop(text_hash, None)
+                
+                if entries:
+                    slots = self._allocate_slots(len(entries))
+                    rows = []
+                    for slot, (text_hash, vector) in zip(slots, entries.items()):
+                        self._vectors[slot] = vector
+                        rows.append((model, text_hash, slot, self._checksum(vector), now))
+                    
+                    # Make vectors visible before publishing them in the index
+                    self._vectors.flush()
+                    self._index.executemany(
+                        "INSERT INTO entries (model, text_hash, slot, crc, last_used) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+                
+                self._index.execute("COMMIT")
+            except Exception:
+                self._index.execute("ROLLBACK")
+                raise
+    
+    def _allocate_slots(self, count: int) -> List[int]:
+        """Allocate slots for new entries inside a write transaction.
+        
+        Args:
+            count: The number of slots needed.
+        
+        Returns:
+            Free slots, reusing those of evicted entries once the cache is full.
+        """
+        used = self._index.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        free = min(count, self.max_entries - used)
+        slots = list(range(used, used + free))
+        
+        # Evict the least recently used entries for the rest
+        if len(slots) < count:
+            evicted = self._index.execute(
+                "SELECT model, text_hash, slot FROM entries ORDER BY last_used LIMIT ?",
+                (count - len(slots),)
+            ).fetchall()
+            self._index.executemany(
+                "DELETE FROM entries WHERE model = ? AND text_hash = ?",
+                [(model, text_hash) for model, text_hash, _ in evicted]
+            )
+            slots.extend(slot for _, _, slot in evicted)
+        
+        return slots
+    
+    def __len__(self) -> int:
+        """Get the number of cached embeddings."""
+        with self._lock:
+            return self._index.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    
+    def close(self) -> None:
+        """Flush the vector map and close the index."""
+        self._vectors.flush()
+        with self._lock:
+            self._index.close()
@@ -187,3 +187,24 @@ class OpenAIProvider(LLMProvider):
         )
         
         return response.data[0].embedding
+    
+    async def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Get embeddings for a batch of texts in a single request.
+        
+        Args:
+            texts: The texts to get embeddings for.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            One embedding per text, in input order.
+        """
+        model = kwargs.get("embedding_model", "text-embedding-ada-002")
+        
+        response = await self.client.embeddings.create(
+            model=model,
+            input=texts,
+            timeout=self.timeout
+        )
+        
+        # Results carry their input index; don't rely on response order
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
@@ -1,10 +1,19 @@
 """LLM service for Deepdevflow."""
 
 from typing import Any, Dict, List, Optional, Union, AsyncGenerator
+import asyncio
 import logging
 
+import numpy as np
+
 from backend.utils.config import config
-from backend.services.llm import LLMProvider, OpenAIProvider
+from backend.services.llm import (
+    LLMProvider,
+    OpenAIProvider,
+    ResponseCache,
+    RequestCoalescer,
+    EmbeddingCache,
+)
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -21,6 +30,7 @@ class LLMService:
         if cls._instance is None:
             cls._instance = super(LLMService, cls).__new__(cls)
             cls._instance._initialize_providers()
+            cls._instance._initialize_cache()
         return cls._instance
     
     def _initialize_providers(self):
@@ -50,6 +60,146 @@ class LLMService:
             else:
                 logger.error("No LLM providers available")
     
+    def _initialize_cache(self):
+        """Initialize the response cache and request coalescer from configuration."""
+        cache_config = config.get_llm_config("cache")
+        
+        self._cache = None
+        if cache_config.get("enabled", False):
+            self._cache = ResponseCache(
+                max_size=cache_config.get("max_size", 10000),
+                ttl=cache_config.get("ttl", 3600)
+            )
+            logger.info("LLM response cache initialized")
+        
+        self._coalescer = None
+        if config.get_llm_config("coalescing").get("enabled", False):
+            self._coalescer = RequestCoalescer()
+            logger.info("LLM request coalescing initialized")
+        
+        # Persistent embedding caches, opened on first use
+        self._embedding_caches: Dict[int, Optional[EmbeddingCache]] = {}
+    
+    def _get_request_key(
+        self, 
+        provider_name: str, 
+        messages: List[Dict[str, str]], 
+        kwargs: Dict[str, Any]
+    ) -> str:
+        """Get the key identifying a request for caching and coalescing.
+        
+        Args:
+            provider_name: The name of the provider handling the request.
+            messages: The request messages.
+            kwargs: The provider-specific parameters.
+            
+        Returns:
+            The request key.
+        """
+        provider = self.get_provider(provider_name)
+        model = kwargs.get("model", getattr(provider, "default_model", None))
+        params = {k: v for k, v in kwargs.items() if k != "model"}
+        params["temperature"] = kwargs.get("temperature", 0.7)
+        
+        return ResponseCache.make_key(provider_name, model, messages, params)
+    
+    def _should_cache(self, use_cache: Optional[bool], kwargs: Dict[str, Any]) -> bool:
+        """Check whether a request may use the response cache.
+        
+        Sampled responses (temperature > 0) are only cached when the caller
+        explicitly opts in with ``use_cache=True``.
+        
+        Args:
+            use_cache: Caller override; None caches only deterministic requests.
+            kwargs: The provider-specific parameters.
+            
+        Returns:
+            True if the cache should be used.
+        """
+        if self._cache is None or use_cache is False:
+            return False
+        
+        # Providers sample with temperature 0.7 unless told otherwise
+        temperature = kwargs.get("temperature")
+        if temperature is None:
+            temperature = 0.7
+        return bool(use_cache) or temperature <= 0
+    
+    async def _call(
+        self, 
+        key: str, 
+        use_cache: Optional[bool], 
+        coalesce: bool, 
+        kwargs: Dict[str, Any], 
+        call
+    ) -> str:
+        """Run a non-streaming request through the cache and coalescer.
+        
+        Args:
+            key: The request key.
+            use_cache: Caller cache override.
+            coalesce: Whether identical in-flight requests may share the call.
+            kwargs: The provider-specific parameters.
+            call: Factory returning the upstream provider coroutine.
+            
+        Returns:
+            The generated text.
+        """
+        cacheable = self._should_cache(use_cache, kwargs)
+        
+        # Check cache
+        if cacheable:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        
+        # Share the upstream call with identical in-flight requests
+        if coalesce and self._coalescer is not None:
+            response = await self._coalescer.run(key, call)
+        else:
+            response = await call()
+        
+        if cacheable and response is not None:
+            self._cache.set(key, response)
+        
+        return response
+    
+    async def _stream(
+        self, 
+        key: str, 
+        coalesce: bool, 
+        call
+    ) -> AsyncGenerator[str, None]:
+        """Run a streaming request through the coalescer.
+        
+        Args:
+            key: The request key.
+            coalesce: Whether identical in-flight requests may share the stream.
+            call: Factory returning the upstream provider stream.
+            
+        Yields:
+            Chunks of generated text.
+        """
+        if coalesce and self._coalescer is not None:
+            async for chunk in self._coalescer.stream(key, call):
+                yield chunk
+        else:
+            async for chunk in call():
+                yield chunk
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get response cache and request coalescing statistics.
+        
+        Returns:
+            A dictionary with cache and coalescing counters.
+        """
+        stats = {}
+        if self._cache is not None:
+            stats.update(self._cache.stats())
+        if self._coalescer is not None:
+            stats.update(self._coalescer.stats())
+        return stats
+    
     def get_provider(self, provider_name: Optional[str] = None) -> LLMProvider:
         """Get a specific provider or the default provider.
         
@@ -69,24 +219,43 @@ class LLMService:
         
         return self._providers[provider_name]
     
-    async def generate(self, prompt: str, provider_name: Optional[str] = None, **kwargs) -> str:
+    async def generate(
+        self, 
+        prompt: str, 
+        provider_name: Optional[str] = None, 
+        use_cache: Optional[bool] = None, 
+        coalesce: bool = True, 
+        **kwargs
+    ) -> str:
         """Generate text from a prompt.
         
         Args:
             prompt: The prompt to generate text from.
             provider_name: The name of the provider to use. If None, uses the default provider.
+            use_cache: Whether to use the response cache. If None, only
+                deterministic (temperature 0) requests are cached.
+            coalesce: Whether identical in-flight requests may share one upstream call.
             **kwargs: Additional provider-specific parameters.
             
         Returns:
             The generated text.
         """
+        provider_name = provider_name or self._default_provider
         provider = self.get_provider(provider_name)
-        return await provider.generate(prompt, **kwargs)
+        key = self._get_request_key(
+            provider_name, [{"role": "user", "content": prompt}], kwargs
+        )
+        
+        return await self._call(
+            key, use_cache, coalesce, kwargs,
+            lambda: provider.generate(prompt, **kwargs)
+        )
     
     async def generate_streaming(
         self, 
         prompt: str, 
         provider_name: Optional[str] = None, 
+        coalesce: bool = True, 
         **kwargs
     ) -> AsyncGenerator[str, None]:
         """Generate text from a prompt with streaming response.
@@ -94,19 +263,29 @@ class LLMService:
         Args:
             prompt: The prompt to generate text from.
             provider_name: The name of the provider to use. If None, uses the default provider.
+            coalesce: Whether identical in-flight requests may share one upstream stream.
             **kwargs: Additional provider-specific parameters.
             
         Yields:
             Chunks of generated text.
         """
+        provider_name = provider_name or self._default_provider
         provider = self.get_provider(provider_name)
-        async for chunk in provider.generate_streaming(prompt, **kwargs):
+        key = self._get_request_key(
+            provider_name, [{"role": "user", "content": prompt}], kwargs
+        )
+        
+        async for chunk in self._stream(
+            key, coalesce, lambda: provider.generate_streaming(prompt, **kwargs)
+        ):
             yield chunk
     
     async def generate_with_history(
         self, 
         messages: List[Dict[str, str]], 
         provider_name: Optional[str] = None, 
+        use_cache: Optional[bool] = None, 
+        coalesce: bool = True, 
         **kwargs
     ) -> str:
         """Generate text from a conversation history.
@@ -114,18 +293,30 @@ class LLMService:
         Args:
             messages: List of message dictionaries with 'role' and 'content' keys.
             provider_name: The name of the provider to use. If None, uses the default provider.
+            use_cache: Whether to use the response cache. If None, only
+                deterministic (temperature 0) requests are cached.
+            coalesce: Whether identical in-flight requests may share one upstream call.
             **kwargs: Additional provider-specific parameters.
             
         Returns:
             The generated text.
         """
+        provider_name = provider_name or self._default_provider
         provider = self.get_provider(provider_name)
-        return await provider.generate_with_history(messages, **kwargs)
+        
+        # Compute the key before the provider prepends its system message
+        key = self._get_request_key(provider_name, messages, kwargs)
+        
+        return await self._call(
+            key, use_cache, coalesce, kwargs,
+            lambda: provider.generate_with_history(messages, **kwargs)
+        )
     
     async def generate_with_history_streaming(
         self, 
         messages: List[Dict[str, str]], 
         provider_name: Optional[str] = None, 
+        coalesce: bool = True, 
         **kwargs
     ) -> AsyncGenerator[str, None]:
         """Generate text from a conversation history with streaming response.
@@ -133,13 +324,20 @@ class LLMService:
         Args:
             messages: List of message dictionaries with 'role' and 'content' keys.
             provider_name: The name of the provider to use. If None, uses the default provider.
+            coalesce: Whether identical in-flight requests may share one upstream stream.
             **kwargs: Additional provider-specific parameters.
             
         Yields:
             Chunks of generated text.
         """
+        provider_name = provider_name or self._default_provider
         provider = self.get_provider(provider_name)
-        async for chunk in provider.generate_with_history_streaming(messages, **kwargs):
+        key = self._get_request_key(provider_name, messages, kwargs)
+        
+        async for chunk in self._stream(
+            key, coalesce,
+            lambda: provider.generate_with_history_streaming(messages, **kwargs)
+        ):
             yield chunk
     
     async def get_embedding(
@@ -158,8 +356,155 @@ class LLMService:
         Returns:
             The embedding as a list of floats.
         """
+        provider_name = provider_name or self._default_provider
+        
+        # Read through the persistent cache when enabled
+        if self._get_embedding_cache(provider_name) is not None:
+            matrix = await self.get_embeddings([text], provider_name, **kwargs)
+            return matrix[0].tolist()
+        
         provider = self.get_provider(provider_name)
         return await provider.get_embedding(text, **kwargs)
+    
+    async def get_embeddings(
+        self, 
+        texts: List[str], 
+        provider_name: Optional[str] = None, 
+        **kwargs
+    ) -> np.ndarray:
+        """Get embeddings for many texts using batched requests.
+        
+        Texts found in the persistent embedding cache are served from it;
+        the rest are split into batches of the provider's configured
+        ``batch_size`` and the batches are sent concurrently, capped at
+        ``embeddings.max_concurrent_batches`` requests in flight.
+        
+        Args:
+            texts: The texts to get embeddings for.
+            provider_name: The name of the provider to use. If None, uses the default provider.
+            **kwargs: Additional provider-specific parameters.
+            
+        Returns:
+            A contiguous float32 matrix with one row per text, in input order.
+        """
+        provider_name = provider_name or self._default_provider
+        provider_config = self._get_embedding_provider_config(provider_name)
+        
+        # Pin the model so cache keys match the model actually used
+        if provider_config.get("model"):
+            kwargs.setdefault("embedding_model", provider_config["model"])
+        
+        cache = self._get_embedding_cache(provider_name)
+        if cache is None or not texts:
+            return await self._embed_batched(provider_name, texts, **kwargs)
+        
+        model = kwargs.get("embedding_model", "")
+        hits = await asyncio.to_thread(cache.get_many, model, texts)
+        if len(hits) == len(texts):
+            return np.stack([hits[i] for i in range(len(texts))])
+        
+        # Embed each missing text once, even if repeated in the input
+        missing = list(dict.fromkeys(text for i, text in enumerate(texts) if i not in hits))
+        computed = await self._embed_batched(provider_name, missing, **kwargs)
+        
+        try:
+            await asyncio.to_thread(cache.put_many, model, missing, computed)
+        except Exception as e:
+            logger.error(f"Error writing embedding cache: {e}")
+        
+        # Cached rows cannot be mixed with differently sized embeddings
+        if computed.shape[1] != cache.dimensions and hits:
+            return await self._embed_batched(provider_name, texts, **kwargs)
+        
+        # Merge cached and computed rows, preserving input order
+        rows = dict(zip(missing, computed))
+        matrix = np.empty((len(texts), computed.shape[1]), dtype=np.float32)
+        for i, text in enumerate(texts):
+            matrix[i] = hits[i] if i in hits else rows[text]
+        
+        return matrix
+    
+    async def _embed_batched(
+        self, 
+        provider_name: str, 
+        texts: List[str], 
+        **kwargs
+    ) -> np.ndarray:
+        """Embed texts with the provider in concurrent batches.
+        
+        Args:
+            provider_name: The name of the provider to use.
+            texts: The texts to get embeddings for.
+            **kwargs: Additional provider-specific parameters.
+            
+        Returns:
+            A contiguous float32 matrix with one row per text, in input order.
+        """
+        provider = self.get_provider(provider_name)
+        
+        # Get batching settings
+        embeddings_config = config.get_llm_config("embeddings")
+        provider_config = self._get_embedding_provider_config(provider_name)
+        batch_size = max(1, provider_config.get("batch_size", 100))
+        semaphore = asyncio.Semaphore(embeddings_config.get("max_concurrent_batches", 4))
+        
+        if not texts:
+            return np.empty((0, provider_config.get("dimensions", 0)), dtype=np.float32)
+        
+        async def embed_batch(start: int) -> List[List[float]]:
+            async with semaphore:
+                return await provider.get_embeddings(texts[start:start + batch_size], **kwargs)
+        
+        batches = await asyncio.gather(*[
+            embed_batch(start) for start in range(0, len(texts), batch_size)
+        ])
+        
+        # Copy batches into one preallocated matrix, preserving input order
+        dimensions = len(batches[0][0])
+        matrix = np.empty((len(texts), dimensions), dtype=np.float32)
+        row = 0
+        for batch in batches:
+            matrix[row:row + len(batch)] = batch
+            row += len(batch)
+        
+        return matrix
+    
+    def _get_embedding_provider_config(self, provider_name: str) -> Dict[str, Any]:
+        """Get the embeddings configuration of a provider."""
+        embeddings_config = config.get_llm_config("embeddings")
+        return embeddings_config.get("providers", {}).get(provider_name, {})
+    
+    def _get_embedding_cache(self, provider_name: str) -> Optional[EmbeddingCache]:
+        """Get the persistent embedding cache for a provider.
+        
+        Caches are opened lazily and shared by providers with the same
+        embedding dimensions; entries are keyed by model, so they never mix.
+        
+        Args:
+            provider_name: The name of the provider.
+            
+        Returns:
+            The embedding cache, or None if caching is disabled or unavailable.
+        """
+        cache_config = config.get_llm_config("embeddings").get("cache", {})
+        dimensions = self._get_embedding_provider_config(provider_name).get("dimensions")
+        
+        if not cache_config.get("enabled", False) or not dimensions:
+            return None
+        
+        if dimensions not in self._embedding_caches:
+            try:
+                self._embedding_caches[dimensions] = EmbeddingCache(
+                    path=cache_config.get("path", "data/embedding_cache"),
+                    dimensions=dimensions,
+                    max_entries=cache_config.get("max_entries", 50000)
+                )
+                logger.info(f"Embedding cache initialized for {dimensions} dimensions")
+            except Exception as e:
+                logger.error(f"Error initializing embedding cache: {e}")
+                self._embedding_caches[dimensions] = None
+        
+        return self._embedding_caches[dimensions]
 
 
 # Create a singleton instance
@@ -0,0 +1,13 @@
+"""Routing package for Deepdevflow."""
+
+from .base import RoutingStrategy
+from .capability_match import CapabilityMatchStrategy
+from .round_robin import RoundRobinStrategy
+from .weighted import WeightedStrategy
+
+__all__ = [
+    "RoutingStrategy",
+    "CapabilityMatchStrategy",
+    "RoundRobinStrategy",
+    "WeightedStrategy",
+]
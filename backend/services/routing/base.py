@@ -0,0 +1,45 @@
+"""Base routing strategy implementation for Deepdevflow."""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional, Set
+
+
+class RoutingStrategy(ABC):
+    """Abstract base class for routing strategies.
+    
+    A strategy picks which remote agent should handle a query. Returning
+    None means no agent qualified and the caller should use the fallback.
+    """
+    
+    @abstractmethod
+    async def add_agent(self, name: str, description: str, capabilities: List[str]) -> None:
+        """Add an agent to the routing table.
+        
+        Args:
+            name: The name of the agent.
+            description: The description of the agent.
+            capabilities: The capabilities of the agent.
+        """
+        pass
+    
+    @abstractmethod
+    def remove_agent(self, name: str) -> None:
+        """Remove an agent from the routing table.
+        
+        Args:
+            name: The name of the agent.
+        """
+        pass
+    
+    @abstractmethod
+    async def select(self, query: str, exclude: Optional[Set[str]] = None) -> Optional[str]:
+        """Select the agent to handle a query.
+        
+        Args:
+            query: The query to route.
+            exclude: Names of agents that must not be selected.
+        
+        Returns:
+            The name of the selected agent, or None if no agent qualified.
+        """
+        pass
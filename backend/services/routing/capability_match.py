@@ -0,0 +1,323 @@
+"""Capability match routing strategy for Deepdevflow."""
+
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.services.llm_service import llm_service
+from .base import RoutingStrategy
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class CapabilityMatchStrategy(RoutingStrategy):
+    """Routes queries to the agent whose capabilities best match them.
+    
+    Each agent's name, description and capabilities are embedded once when
+    it is added, and the unit vectors are kept stacked in one matrix, so a
+    query is scored against every agent with a single matrix product. The
+    semantic score is combined with a lexical score for capabilities named
+    in the query, which keeps routing working when embeddings are unavailable.
+    
+    Embedding models score even unrelated texts well above zero, so an agent
+    is only selected on its semantic score when it also leads the runner-up
+    by ``margin``; a capability named in the query always counts.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        margin: float = 0.05,
+        weights: Optional[Dict[str, float]] = None,
+        memo_size: int = 256,
+        retry_interval: float = 60
+    ):
+        """Initialize the strategy.
+        
+        Args:
+            threshold: Minimum score for an agent to be selected.
+            margin: Lead over the runner-up required when no capability is named in the query.
+            weights: Lexical weights for "exact_match" and "partial_match" capabilities.
+            memo_size: Number of recent query scores to remember.
+            retry_interval: Seconds to wait before retrying failed profile embeddings.
+        """
+        weights = weights or {}
+        self.threshold = threshold
+        self.margin = margin
+        self.exact_weight = weights.get("exact_match", 1.0)
+        self.partial_weight = weights.get("partial_match", 0.5)
+        self.memo_size = memo_size
+        self.retry_interval = retry_interval
+        self._retry_at = 0.0
+        
+        # Routing table
+        self._names: List[str] = []
+        self._capabilities: Dict[str, List[List[str]]] = {}
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._texts: Dict[str, str] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._version = 0
+        
+        # Scores of recent queries with the agent names they are aligned with,
+        # valid until the routing table changes
+        self._memo: "OrderedDict[str, Tuple[Tuple[str, ...], np.ndarray]]" = OrderedDict()
+    
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        """Split text into lowercase word tokens."""
+        return re.findall(r"[a-z0-9]+", text.lower().replace("_", " "))
+    
+    async def add_agent(self, name: str, description: str, capabilities: List[str]) -> None:
+        """Add an agent and embed its profile.
+        
+        Args:
+            name: The name of the agent.
+            description: The description of the agent.
+            capabilities: The capabilities of the agent.
+        """
+        if name not in self._names:
+            self._names.append(name)
+        
+        self._capabilities[name] = [self._tokenize(c) for c in capabilities if self._tokenize(c)]
+        self._texts[name] = (
+            f"{name}: {description or ''}. "
+            f"Capabilities: {', '.join(c.replace('_', ' ') for c in capabilities)}"
+        )
+        self._vectors.pop(name, None)
+        
+        # Keep the matrix aligned with the names while the profile is embedded
+        self._rebuild()
+        if time.monotonic() >= self._retry_at and await self._embed_agents([name]):
+            self._rebuild()
+    
+    def remove_agent(self, name: str) -> None:
+        """Remove an agent from the routing table.
+        
+        Args:
+            name: The name of the agent.
+        """
+        if name not in self._names:
+            return
+        
+        self._names.remove(name)
+        self._capabilities.pop(name, None)
+        self._vectors.pop(name, None)
+        self._texts.pop(name, None)
+        self._rebuild()
+    
+    async def select(self, query: str, exclude: Optional[Set[str]] = None) -> Optional[str]:
+        """Select the agent whose capabilities best match a query.
+        
+        Args:
+            query: The query to route.
+            exclude: Names of agents that must not be selected.
+        
+        Returns:
+            The name of the best agent scoring at least the threshold, or None
+            if it names none of its capabilities and leads by less than the margin.
+        """
+        if not self._names or not query:
+            return None
+        
+        names, scores = await self._get_scores(query)
+        if not names:
+            return None
+        
+        # Never pick excluded agents
+        if exclude:
+            scores = scores.copy()
+            for i, name in enumerate(names):
+                if name in exclude:
+                    scores[i] = -np.inf
+        
+        best = int(np.argmax(scores))
+        selected = names[best] if scores[best] >= self.threshold else None
+        
+        # Without a capability named in the query, only a clear lead counts
+        if selected is not None and self._lexical_scores(query, (selected,))[0] <= 0:
+            runner_up = np.max(np.delete(scores, best)) if len(scores) > 1 else -np.inf
+            if scores[best] - runner_up < self.margin:
+                selected = None
+        
+        logger.debug(f"Routed query to {selected} (score {scores[best]:.3f})")
+        
+        return selected
+    
+    async def rank(self, query: str, k: int) -> List[str]:
+        """Rank agents by how well their capabilities match a query.
+        
+        Args:
+            query: The query to rank agents for.
+            k: The maximum number of agents to return.
+        
+        Returns:
+            The names of the best matching agents, best first.
+        """
+        if not self._names or not query or k <= 0:
+            return []
+        
+        names, scores = await self._get_scores(query)
+        return self._top(names, scores, k)
+    
+    def rank_cached(self, query: str, k: int) -> List[str]:
+        """Rank agents without embedding the query, for callers that cannot await.
+        
+        Uses the scores remembered from an earlier ``rank`` or ``select`` of
+        the same query, and the lexical scores if there are none.
+        
+        Args:
+            query: The query to rank agents for.
+            k: The maximum number of agents to return.
+        
+        Returns:
+            The names of the best matching agents, best first.
+        """
+        if not self._names or not query or k <= 0:
+            return []
+        
+        cached = self._memo.get(query)
+        if cached is not None:
+            self._memo.move_to_end(query)
+            names, scores = cached
+        else:
+            names = tuple(self._names)
+            scores = self._lexical_scores(query, names)
+        return self._top(names, scores, k)
+    
+    @staticmethod
+    def _top(names: Tuple[str, ...], scores: np.ndarray, k: int) -> List[str]:
+        """Get the names of the k best scoring agents, best first."""
+        # Stable sort keeps registration order among equal scores
+        best = np.argsort(-scores, kind="stable")[:k]
+        return [names[i] for i in best]
+    
+    async def _get_scores(self, query: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """Get the scores of a query, reusing the scores of recent queries.
+        
+        Args:
+            query: The query to score.
+        
+        Returns:
+            A tuple of (names, scores) with one score per named agent.
+        """
+        cached = self._memo.get(query)
+        if cached is not None:
+            self._memo.move_to_end(query)
+            return cached
+        
+        version = self._version
+        cached = await self._score(query)
+        
+        # Remember the scores unless the routing table changed meanwhile
+        if version == self._version:
+            self._memo[query] = cached
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return cached
+    
+    async def _score(self, query: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """Score every agent against a query.
+        
+        The names and the matrix are captured together before the query is
+        embedded, so agents added or removed meanwhile cannot misalign them.
+        
+        Args:
+            query: The query to score.
+        
+        Returns:
+            A tuple of (names, scores), each score the higher of the agent's
+            semantic and lexical scores.
+        """
+        # Retry agents whose profile could not be embedded earlier
+        missing = [name for name in self._names if name not in self._vectors]
+        if missing and time.monotonic() >= self._retry_at and await self._embed_agents(missing):
+            self._rebuild()
+        
+        names = tuple(self._names)
+        matrix = self._matrix
+        scores = self._lexical_scores(query, names)
+        
+        # Score every agent at once against the normalized query embedding
+        if matrix is not None:
+            try:
+                embedding = (await llm_service.get_embeddings([query]))[0]
+                norm = np.linalg.norm(embedding)
+                if norm > 0 and embedding.shape[0] == matrix.shape[1]:
+                    scores = np.maximum(scores, matrix @ (embedding / norm))
+            except Exception as e:
+                logger.error(f"Error embedding query for routing: {e}")
+        
+        return names, scores
+    
+    def _lexical_scores(self, query: str, names: Tuple[str, ...]) -> np.ndarray:
+        """Score agents by the capabilities named in a query.
+        
+        Args:
+            query: The query to score.
+            names: The names of the agents to score.
+        
+        Returns:
+            One score per agent: the exact weight when a capability appears as a
+            phrase, otherwise the partial weight scaled by the share of its words present.
+        """
+        tokens = self._tokenize(query)
+        token_set = set(tokens)
+        padded = f" {' '.join(tokens)} "
+        scores = np.zeros(len(names), dtype=np.float32)
+        
+        for i, name in enumerate(names):
+            for capability in self._capabilities.get(name, []):
+                if f" {' '.join(capability)} " in padded:
+                    score = self.exact_weight
+                else:
+                    overlap = sum(1 for token in capability if token in token_set)
+                    score = self.partial_weight * overlap / len(capability)
+                scores[i] = max(scores[i], score)
+        
+        return scores
+    
+    async def _embed_agents(self, names: List[str]) -> bool:
+        """Embed agent profiles into unit vectors.
+        
+        Args:
+            names: The names of the agents to embed.
+        
+        Returns:
+            True if the profiles were embedded, False otherwise.
+        """
+        try:
+            embeddings = await llm_service.get_embeddings([self._texts[name] for name in names])
+        except Exception as e:
+            logger.error(f"Error embedding agent profiles for routing: {e}")
+            self._retry_at = time.monotonic() + self.retry_interval
+            return False
+        
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        for name, vector in zip(names, embeddings / norms):
+            # Skip agents removed while their profile was embedded
+            if name in self._texts:
+                self._vectors[name] = vector
+        return True
+    
+    def _rebuild(self) -> None:
+        """Rebuild the agent matrix after the routing table changed."""
+        self._version += 1
+        self._memo.clear()
+        
+        dimensions = next((v.shape[0] for v in self._vectors.values()), None)
+        if dimensions is None:
+            self._matrix = None
+            return
+        
+        # Agents without an embedding get a zero row so rows stay aligned with names
+        self._matrix = np.zeros((len(self._names), dimensions), dtype=np.float32)
+        for i, name in enumerate(self._names):
+            vector = self._vectors.get(name)
+            if vector is not None and vector.shape[0] == dimensions:
+                self._matrix[i] = vector
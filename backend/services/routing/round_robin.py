@@ -0,0 +1,55 @@
+"""Round robin routing strategy for Deepdevflow."""
+
+from typing import List, Optional, Set
+
+from .base import RoutingStrategy
+
+
+class RoundRobinStrategy(RoutingStrategy):
+    """Rotates queries across agents in registration order."""
+    
+    def __init__(self):
+        """Initialize the strategy."""
+        self._names: List[str] = []
+        self._position = 0
+    
+    async def add_agent(self, name: str, description: str, capabilities: List[str]) -> None:
+        """Add an agent to the rotation.
+        
+        Args:
+            name: The name of the agent.
+            description: The description of the agent.
+            capabilities: The capabilities of the agent.
+        """
+        if name not in self._names:
+            self._names.append(name)
+    
+    def remove_agent(self, name: str) -> None:
+        """Remove an agent from the rotation.
+        
+        Args:
+            name: The name of the agent.
+        """
+        if name in self._names:
+            self._names.remove(name)
+    
+    async def select(self, query: str, exclude: Optional[Set[str]] = None) -> Optional[str]:
+        """Select the next agent in the rotation.
+        
+        Args:
+            query: The query to route.
+            exclude: Names of agents that must not be selected.
+        
+        Returns:
+            The name of the next agent, or None if no agent is available.
+        """
+        exclude = exclude or set()
+        
+        # Skip excluded agents, trying each agent at most once
+        for _ in range(len(self._names)):
+            name = self._names[self._position % len(self._names)]
+            self._position = (self._position + 1) % len(self._names)
+            if name not in exclude:
+                return name
+        
+        return None
@@ -0,0 +1,89 @@
+"""Weighted routing strategy for Deepdevflow."""
+
+from typing import Callable, Dict, List, Optional, Set
+
+from .base import RoutingStrategy
+
+
+class WeightedStrategy(RoutingStrategy):
+    """Spreads queries across agents in proportion to their weights.
+    
+    Uses smooth weighted round robin: every pick adds each agent's effective
+    weight to its running score, selects the highest score and subtracts the
+    total from it. This interleaves agents evenly instead of in bursts. The
+    effective weight is the configured weight divided by one plus the agent's
+    pending task count, so load shifts away from saturated agents.
+    """
+    
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        load: Optional[Callable[[str], int]] = None,
+        default_weight: float = 1.0
+    ):
+        """Initialize the strategy.
+        
+        Args:
+            weights: Configured weight per agent name.
+            load: Returns the number of pending tasks of an agent.
+            default_weight: Weight of agents without a configured weight.
+        """
+        self.weights = weights or {}
+        self.load = load
+        self.default_weight = default_weight
+        self._current: Dict[str, float] = {}
+    
+    async def add_agent(self, name: str, description: str, capabilities: List[str]) -> None:
+        """Add an agent to the schedule.
+        
+        Args:
+            name: The name of the agent.
+            description: The description of the agent.
+            capabilities: The capabilities of the agent.
+        """
+        self._current.setdefault(name, 0.0)
+    
+    def remove_agent(self, name: str) -> None:
+        """Remove an agent from the schedule.
+        
+        Args:
+            name: The name of the agent.
+        """
+        self._current.pop(name, None)
+    
+    def _effective_weight(self, name: str) -> float:
+        """Get the weight of an agent adjusted for its current load."""
+        weight = max(0.0, self.weights.get(name, self.default_weight))
+        if self.load is not None:
+            weight /= 1 + self.load(name)
+        return weight
+    
+    async def select(self, query: str, exclude: Optional[Set[str]] = None) -> Optional[str]:
+        """Select the next agent in the weighted schedule.
+        
+        Args:
+            query: The query to route.
+            exclude: Names of agents that must not be selected.
+        
+        Returns:
+            The name of the selected agent, or None if no agent has a positive weight.
+        """
+        exclude = exclude or set()
+        total = 0.0
+        selected = None
+        
+        for name in self._current:
+            if name in exclude:
+                continue
+            weight = self._effective_weight(name)
+            if weight <= 0:
+                continue
+            self._current[name] += weight
+            total += weight
+            if selected is None or self._current[name] > self._current[selected]:
+                selected = name
+        
+        if selected is not None:
+            self._current[selected] -= total
+        
+        return selected
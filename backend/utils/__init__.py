@@ -5,17 +5,31 @@ from .database import (
     get_engine,
     get_session,
     get_session_factory,
+    get_async_engine,
+    get_async_session,
+    get_async_session_factory,
+    dispose_engines,
     create_tables,
+    create_indexes,
     drop_tables,
     init_db
 )
+from .http_client import get_http_client, get_host_limit, close_http_client
 
 __all__ = [
     "config",
     "get_engine",
     "get_session",
     "get_session_factory",
+    "get_async_engine",
+    "get_async_session",
+    "get_async_session_factory",
+    "dispose_engines",
     "create_tables",
+    "create_indexes",
     "drop_tables",
-    "init_db"
+    "init_db",
+    "get_http_client",
+    "get_host_limit",
+    "close_http_client"
 ]
@@ -2,8 +2,10 @@
 
 import os
 import yaml
-from typing import Any, Dict, Optional
-from sqlalchemy import create_engine
+from typing import Any, AsyncGenerator, Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session, Session
 
@@ -13,6 +15,15 @@ from backend.models import Base
 # Global variables
 _ENGINE = None
 _SESSION_FACTORY = None
+_ASYNC_ENGINE = None
+_ASYNC_SESSION_FACTORY = None
+
+# Async drivers used for each sync dialect
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
 
 
 def load_config() -> Dict[str, Any]:
@@ -24,14 +35,90 @@ def load_config() -> Dict[str, Any]:
     return config["database"]
 
 
+def get_engine_options(config: Dict[str, Any], connection_string: str) -> Dict[str, Any]:
+    """Build engine keyword arguments from the database configuration.
+    
+    Args:
+        config: The database configuration section.
+        connection_string: The connection string the engine is created for.
+        
+    Returns:
+        Keyword arguments for create_engine/create_async_engine.
+    """
+    url = make_url(connection_string)
+    options = {
+        "echo": config.get("echo", False),
+        "pool_pre_ping": config.get("pool_pre_ping", True),
+    }
+    
+    # In-memory SQLite uses a single shared connection, so pool sizing does not apply
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+    
+    options.update({
+        "pool_size": config.get("pool_size", 5),
+        "max_overflow": config.get("max_overflow", 10),
+        "pool_recycle": config.get("pool_recycle", 3600),
+        "pool_timeout": config.get("pool_timeout", 30),
+    })
+    
+    if url.get_backend_name() == "sqlite":
+        sqlite_config = config.get("sqlite", {})
+        options["connect_args"] = {
+            # Connections are shared between threads by the pool
+            "check_same_thread": False,
+            # Driver-level lock wait, in seconds
+            "timeout": sqlite_config.get("busy_timeout", 5000) / 1000,
+        }
+    elif config.get("connect_args"):
+        options["connect_args"] = dict(config["connect_args"])
+    
+    return options
+
+
+def register_sqlite_pragmas(engine, config: Dict[str, Any]) -> None:
+    """Apply SQLite pragmas to every new connection of an engine.
+    
+    WAL journal mode lets readers proceed while a single writer commits,
+    which avoids "database is locked" errors under concurrent load.
+    
+    Args:
+        engine: The sync engine (use ``AsyncEngine.sync_engine`` for async engines).
+        config: The database configuration section.
+    """
+    if engine.url.get_backend_name() != "sqlite":
+        return
+    
+    sqlite_config = config.get("sqlite", {})
+    pragmas = {
+        "journal_mode": sqlite_config.get("journal_mode", "WAL"),
+        "synchronous": sqlite_config.get("synchronous", "NORMAL"),
+        "busy_timeout": sqlite_config.get("busy_timeout", 5000),
+        "mmap_size": sqlite_config.get("mmap_size", 268435456),
+    }
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
 def get_engine():
     """Get database engine."""
     global _ENGINE
     if _ENGINE is None:
         config = load_config()
         connection_string = config["connection_string"]
-        echo = config.get("echo", False)
-        _ENGINE = create_engine(connection_string, echo=echo)
+        _ENGINE = create_engine(
+            connection_string,
+            **get_engine_options(config, connection_string)
+        )
+        register_sqlite_pragmas(_ENGINE, config)
     return _ENGINE
 
 
@@ -50,12 +137,93 @@ def get_session() -> Session:
     return factory()
 
 
+def get_async_connection_string(connection_string: str) -> str:
+    """Convert a sync connection string to its async driver equivalent.
+    
+    Args:
+        connection_string: The configured connection string.
+        
+    Returns:
+        The connection string using an async driver.
+    """
+    url = make_url(connection_string)
+    
+    # Keep explicitly configured drivers (e.g. sqlite+aiosqlite)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=f"{url.drivername}+{ASYNC_DRIVERS[url.drivername]}")
+    
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    """Get async database engine."""
+    global _ASYNC_ENGINE
+    if _ASYNC_ENGINE is None:
+        config = load_config()
+        connection_string = get_async_connection_string(config["connection_string"])
+        _ASYNC_ENGINE = create_async_engine(
+            connection_string,
+            **get_engine_options(config, connection_string)
+        )
+        register_sqlite_pragmas(_ASYNC_ENGINE.sync_engine, config)
+    return _ASYNC_ENGINE
+
+
+def get_async_session_factory():
+    """Get async session factory."""
+    global _ASYNC_SESSION_FACTORY
+    if _ASYNC_SESSION_FACTORY is None:
+        engine = get_async_engine()
+        # Keep attributes loaded after commit so objects can be serialized
+        # without triggering implicit IO outside of an awaitable context
+        _ASYNC_SESSION_FACTORY = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _ASYNC_SESSION_FACTORY
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get a new async database session.
+    
+    Intended for use as a FastAPI dependency; the session is closed once
+    the request is finished.
+    """
+    factory = get_async_session_factory()
+    async with factory() as session:
+        yield session
+
+
+async def dispose_engines():
+    """Dispose all database engines and their connection pools."""
+    global _ASYNC_ENGINE, _ASYNC_SESSION_FACTORY
+    if _ASYNC_ENGINE is not None:
+        await _ASYNC_ENGINE.dispose()
+        _ASYNC_ENGINE = None
+        _ASYNC_SESSION_FACTORY = None
+    if _ENGINE is not None:
+        _ENGINE.dispose()
+
+
 def create_tables():
     """Create all tables in the database."""
     engine = get_engine()
     Base.metadata.create_all(engine)
 
 
+def create_indexes():
+    """Create any missing indexes on existing tables.
+    
+    ``create_all`` skips tables that already exist, so indexes added to the
+    models later are not created on existing databases without this.
+    """
+    engine = get_engine()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def drop_tables():
     """Drop all tables from the database."""
     engine = get_engine()
@@ -65,3 +233,4 @@ def drop_tables():
 def init_db():
     """Initialize the database."""
     create_tables()
+    create_indexes()
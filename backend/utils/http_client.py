@@ -0,0 +1,84 @@
+"""Shared HTTP client module for Deepdevflow."""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Dict
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import config
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Global variables
+_HTTP_CLIENT = None
+_HOST_LIMITS: Dict[str, asyncio.Semaphore] = {}
+_STREAM_LIMITS: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client used for remote agent calls.
+    
+    The client is normally opened in the application lifespan; it is
+    created on first use otherwise.
+    """
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        connection_config = config.get_agent_config("connection")
+        pool_config = connection_config.get("pool", {})
+        
+        # HTTP/2 needs the optional h2 package
+        http2 = connection_config.get("http2", False)
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.info("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+            http2 = False
+        
+        _HTTP_CLIENT = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(
+                connection_config.get("timeout", 30),
+                connect=pool_config.get("connect_timeout", 5)
+            ),
+            limits=httpx.Limits(
+                max_connections=pool_config.get("max_connections", 100),
+                max_keepalive_connections=pool_config.get("max_keepalive_connections", 20),
+                keepalive_expiry=pool_config.get("keepalive_expiry", 30)
+            )
+        )
+    return _HTTP_CLIENT
+
+
+def get_host_limit(url: str, streaming: bool = False) -> asyncio.Semaphore:
+    """Get the semaphore capping concurrent requests to the host of a URL.
+    
+    Streaming requests hold their slot for as long as the remote task runs,
+    so they are capped separately and cannot starve short requests such as
+    status polls and health probes.
+    
+    Args:
+        url: A URL on the host.
+        streaming: Whether the limit is for long-lived streaming requests.
+        
+    Returns:
+        The semaphore shared by all requests of that kind to that host.
+    """
+    host = urlsplit(url).netloc
+    limits = _STREAM_LIMITS if streaming else _HOST_LIMITS
+    if host not in limits:
+        pool_config = config.get_agent_config("connection").get("pool", {})
+        key = "max_streams_per_host" if streaming else "max_connections_per_host"
+        limits[host] = asyncio.Semaphore(pool_config.get(key, 10))
+    return limits[host]
+
+
+async def close_http_client():
+    """Close the shared HTTP client and its connection pool."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+    _HOST_LIMITS.clear()
+    _STREAM_LIMITS.clear()
@@ -10,6 +10,9 @@ from typing import List, Dict, Any, Optional
 
 from frontend.utils.async_utils import run_async
 
+# Messages committed up to this many seconds after their timestamp are still picked up
+MESSAGE_SETTLE_SECONDS = 10
+
 
 def show_conversation_page():
     """Display the conversation page."""
@@ -364,13 +367,43 @@ def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
 
 
 def get_messages(conversation_id: str) -> List[Dict[str, Any]]:
-    """Get messages for a conversation."""
+    """
+    Get messages for a conversation.
+    
+    Messages are cached in the session state, so each rerun only fetches
+    recent messages. Timestamps are assigned before commit, so concurrent
+    writers can commit a message with an earlier timestamp after a later one;
+    the fetch therefore starts a settle window before the newest cached
+    message and merges the results by ID.
+    """
+    if "message_cache" not in st.session_state:
+        st.session_state.message_cache = {}
+    
+    cached = st.session_state.message_cache.get(conversation_id, [])
+    
     try:
         api_client = st.session_state.api_client
-        return run_async(api_client.list_messages(conversation_id=conversation_id))
+        
+        # Fetch the messages after the settle window of the newest cached one
+        after = None
+        if cached:
+            newest = datetime.datetime.fromisoformat(cached[-1]["created_at"].replace("Z", "+00:00"))
+            after = (newest - datetime.timedelta(seconds=MESSAGE_SETTLE_SECONDS)).isoformat()
+        new_messages = run_async(api_client.list_messages_since(
+            conversation_id=conversation_id,
+            after=after
+        ))
+        
+        # Merge late commits into their (created_at, id) position
+        known_ids = {message["id"] for message in cached}
+        added = [message for message in new_messages if message["id"] not in known_ids]
+        if added:
+            cached = sorted(cached + added, key=lambda message: (message["created_at"], message["id"]))
+        st.session_state.message_cache[conversation_id] = cached
+        return cached
     except Exception as e:
         st.error(f"Error getting messages: {str(e)}")
-        return []
+        return cached
 
 
 def format_timestamp(timestamp_str: str) -> str:
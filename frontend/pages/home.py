@@ -3,7 +3,6 @@ Home page for Deepdevflow Streamlit UI
 """
 
 import streamlit as st
-import asyncio
 import datetime
 from typing import List, Dict, Any
 
@@ -130,24 +129,13 @@ async def get_stats_async() -> Dict[str, int]:
     try:
         api_client = st.session_state.api_client
         
-        # Run these in parallel
-        sessions_task = api_client.list_sessions()
-        agents_task = api_client.list_agents()
-        
-        # Wait for both tasks to complete
-        sessions, agents = await asyncio.gather(sessions_task, agents_task)
-        
-        # Count conversations across all sessions
-        conversation_count = 0
-        for session in sessions:
-            # Get conversations for session
-            conversations = await api_client.list_conversations(session_id=session["id"])
-            conversation_count += len(conversations)
+        # All counts come from a single aggregated request
+        stats = await api_client.get_stats()
         
         return {
-            "sessions": len(sessions),
-            "conversations": conversation_count,
-            "agents": len(agents)
+            "sessions": stats["sessions"]["active"],
+            "conversations": stats["conversations"]["active"],
+            "agents": stats["agents"]["active"]
         }
     except Exception as e:
         # In case of error, return zeros
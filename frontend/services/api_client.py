@@ -98,6 +98,50 @@ class ApiClient:
             logger.error(f"Request error: {str(e)}")
             raise Exception(f"Request failed: {str(e)}")
     
+    @staticmethod
+    def _page_params(cursor: Optional[str], limit: Optional[int]) -> Dict[str, Any]:
+        """
+        Build query parameters for a paginated list request
+        
+        Args:
+            cursor: Cursor returned by the previous page
+            limit: Maximum number of items in the page
+            
+        Returns:
+            Query parameters dictionary
+        """
+        params = {}
+        
+        if cursor:
+            params["cursor"] = cursor
+            
+        if limit:
+            params["limit"] = limit
+            
+        return params
+    
+    async def _list_all_pages(self, list_page, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Collect the items of every page of a list request, following page cursors
+        
+        Args:
+            list_page: Method listing one page, taking a cursor argument
+            **kwargs: Arguments passed to every page request
+            
+        Returns:
+            List of items from all pages
+        """
+        items = []
+        cursor = None
+        
+        while True:
+            page = await list_page(cursor=cursor, **kwargs)
+            items.extend(page["items"])
+            cursor = page.get("next_cursor")
+            
+            if not cursor:
+                return items
+    
     # Session endpoints
     
     async def create_session(self, name: str, user_id: Optional[str] = None) -> Dict[str, Any]:
@@ -126,9 +170,29 @@ class ApiClient:
             active_only: Whether to return only active sessions
             
         Returns:
-            List of sessions
+            List of all sessions, following page cursors
         """
-        params = {"active_only": active_only}
+        return await self._list_all_pages(self.list_sessions_page, active_only=active_only)
+    
+    async def list_sessions_page(
+        self, 
+        active_only: bool = True,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        List one page of sessions
+        
+        Args:
+            active_only: Whether to return only active sessions
+            cursor: Cursor returned by the previous page
+            limit: Maximum number of sessions in the page
+            
+        Returns:
+            Page with "items" and "next_cursor" (None on the last page)
+        """
+        params = self._page_params(cursor, limit)
+        params["active_only"] = active_only
         return await self._request("GET", "/sessions", params=params)
     
     async def get_session(self, session_id: str, include_conversations: bool = False) -> Dict[str, Any]:
@@ -178,11 +242,35 @@ class ApiClient:
             active_only: Whether to return only active conversations
             
         Returns:
-            List of conversations
+            List of all conversations, following page cursors
         """
-        params = {
-            "active_only": active_only
-        }
+        return await self._list_all_pages(
+            self.list_conversations_page,
+            session_id=session_id,
+            active_only=active_only
+        )
+    
+    async def list_conversations_page(
+        self, 
+        session_id: Optional[str] = None, 
+        active_only: bool = True,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        List one page of conversations
+        
+        Args:
+            session_id: Optional session ID to filter by
+            active_only: Whether to return only active conversations
+            cursor: Cursor returned by the previous page
+            limit: Maximum number of conversations in the page
+            
+        Returns:
+            Page with "items" and "next_cursor" (None on the last page)
+        """
+        params = self._page_params(cursor, limit)
+        params["active_only"] = active_only
         
         if session_id:
             params["session_id"] = session_id
@@ -217,9 +305,60 @@ class ApiClient:
             conversation_id: Conversation ID
             
         Returns:
-            List of messages
+            List of all messages, oldest first, following page cursors
         """
-        return await self._request("GET", f"/conversations/{conversation_id}/messages")
+        return await self._list_all_pages(self.list_messages_page, conversation_id=conversation_id)
+    
+    async def list_messages_page(
+        self, 
+        conversation_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        List one page of messages in a conversation, oldest first
+        
+        Args:
+            conversation_id: Conversation ID
+            cursor: Cursor returned by the previous page
+            limit: Maximum number of messages in the page
+            after: Optional message ID or ISO timestamp; only newer messages are listed
+            
+        Returns:
+            Page with "items" and "next_cursor" (None on the last page)
+        """
+        params = self._page_params(cursor, limit)
+        
+        if after:
+            params["after"] = after
+            
+        return await self._request(
+            "GET", 
+            f"/conversations/{conversation_id}/messages", 
+            params=params
+        )
+    
+    async def list_messages_since(
+        self, 
+        conversation_id: str,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List all messages newer than a message, following page cursors
+        
+        Args:
+            conversation_id: Conversation ID
+            after: Message ID or ISO timestamp to start after; None lists the full history
+            
+        Returns:
+            List of messages, oldest first
+        """
+        return await self._list_all_pages(
+            self.list_messages_page,
+            conversation_id=conversation_id,
+            after=after
+        )
     
     async def create_message(
         self,
@@ -294,6 +433,7 @@ class ApiClient:
                     "POST", 
                     url, 
                     content=json.dumps(data), 
+                    params={"stream_format": "ndjson"},
                     headers=headers
                 ) as response:
                     async for chunk in response.aiter_lines():
@@ -316,9 +456,29 @@ class ApiClient:
             active_only: Whether to return only active agents
             
         Returns:
-            List of agents
+            List of all agents, following page cursors
+        """
+        return await self._list_all_pages(self.list_agents_page, active_only=active_only)
+    
+    async def list_agents_page(
+        self, 
+        active_only: bool = True,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        List one page of agents
+        
+        Args:
+            active_only: Whether to return only active agents
+            cursor: Cursor returned by the previous page
+            limit: Maximum number of agents in the page
+            
+        Returns:
+            Page with "items" and "next_cursor" (None on the last page)
         """
-        params = {"active_only": active_only}
+        params = self._page_params(cursor, limit)
+        params["active_only"] = active_only
         return await self._request("GET", "/agents", params=params)
     
     async def get_agent(self, agent_id: str) -> Dict[str, Any]:
@@ -408,3 +568,14 @@ class ApiClient:
             agent_id: Agent ID
         """
         await self._request("POST", f"/agents/{agent_id}/unregister")
+    
+    # Stats endpoints
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get aggregated system statistics
+        
+        Returns:
+            Session, conversation, agent, message and task counts
+        """
+        return await self._request("GET", "/stats")
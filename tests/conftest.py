@@ -0,0 +1,72 @@
+"""Shared fixtures for the Deepdevflow tests."""
+
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+# Use the bundled model cost map instead of fetching it when litellm is imported
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from backend.models import Base
+from backend.routes import agent, conversation, session
+from backend.utils import database, http_client
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point the sync and async database engines at a fresh SQLite file."""
+    path = tmp_path / "deepdevflow.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Base.metadata.create_all(engine)
+    
+    monkeypatch.setattr(database, "_ENGINE", engine)
+    monkeypatch.setattr(database, "_SESSION_FACTORY", scoped_session(
+        sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    ))
+    monkeypatch.setattr(database, "_ASYNC_ENGINE", async_engine)
+    monkeypatch.setattr(database, "_ASYNC_SESSION_FACTORY", async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    ))
+    yield engine
+    
+    database._SESSION_FACTORY.remove()
+    engine.dispose()
+    async_engine.sync_engine.dispose()
+
+
+@pytest.fixture
+async def api(db):
+    """HTTP client for the session, conversation and agent routes."""
+    app = FastAPI()
+    app.include_router(session.router)
+    app.include_router(conversation.router)
+    app.include_router(agent.router)
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def serve_http(monkeypatch):
+    """Install a shared HTTP client whose requests are answered by a handler.
+    
+    Returns a function taking the handler, a callable from httpx.Request to
+    httpx.Response, as for httpx.MockTransport.
+    """
+    monkeypatch.setattr(http_client, "_HOST_LIMITS", {})
+    monkeypatch.setattr(http_client, "_STREAM_LIMITS", {})
+    
+    def serve(handler):
+        monkeypatch.setattr(http_client, "_HTTP_CLIENT", httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ))
+    
+    return serve
@@ -0,0 +1,39 @@
+"""Tests for the frontend API client."""
+
+import httpx
+import pytest
+
+from frontend.services.api_client import ApiClient
+
+
+@pytest.fixture
+def paged_api():
+    """API client over a backend serving five items per list, two per page."""
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        start = int(request.url.params.get("cursor", 0))
+        items = [{"id": str(i)} for i in range(start, min(start + 2, 5))]
+        next_cursor = str(start + 2) if start + 2 < 5 else None
+        return httpx.Response(200, json={"items": items, "next_cursor": next_cursor})
+    
+    client = ApiClient(base_url="http://test")
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, requests
+
+
+@pytest.mark.parametrize("method, args", [
+    ("list_sessions", {}),
+    ("list_conversations", {"session_id": "session-1"}),
+    ("list_agents", {}),
+    ("list_messages", {"conversation_id": "conversation-1"}),
+])
+async def test_list_methods_follow_cursors(paged_api, method, args):
+    client, requests = paged_api
+    
+    items = await getattr(client, method)(**args)
+    
+    assert [item["id"] for item in items] == ["0", "1", "2", "3", "4"]
+    assert [request.url.params.get("cursor") for request in requests] == [None, "2", "4"]
+    await client.close()
@@ -0,0 +1,89 @@
+"""Tests for the capability match routing strategy."""
+
+import numpy as np
+import pytest
+
+from backend.services.llm_service import llm_service
+from backend.services.routing import CapabilityMatchStrategy
+
+# Toy embedding space: one axis per topic
+TOPICS = ["code", "math", "writing"]
+
+
+def embed(text):
+    text = text.lower()
+    return np.array([float(topic in text) for topic in TOPICS]) + 0.01
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    """Embed texts along the topics they mention, counting the calls."""
+    calls = []
+    
+    async def get_embeddings(texts, **kwargs):
+        calls.append(list(texts))
+        return np.stack([embed(text) for text in texts])
+    
+    monkeypatch.setattr(llm_service, "get_embeddings", get_embeddings)
+    return calls
+
+
+@pytest.fixture
+async def strategy(embeddings):
+    strategy = CapabilityMatchStrategy(threshold=0.7)
+    await strategy.add_agent("coder", "Writes code", ["code_review"])
+    await strategy.add_agent("mathematician", "Solves math", ["algebra"])
+    await strategy.add_agent("writer", "Edits writing", ["proofreading"])
+    return strategy
+
+
+async def test_rank_cached_reuses_the_scores_of_rank(strategy, embeddings):
+    ranked = await strategy.rank("help me with math homework", 2)
+    calls = len(embeddings)
+    
+    assert strategy.rank_cached("help me with math homework", 2) == ranked
+    assert ranked[0] == "mathematician"
+    assert len(embeddings) == calls
+
+
+async def test_rank_cached_falls_back_to_lexical_scores(strategy, embeddings):
+    calls = len(embeddings)
+    
+    assert strategy.rank_cached("please do a code review", 1) == ["coder"]
+    assert len(embeddings) == calls
+
+
+async def test_rank_cached_sees_table_changes(strategy):
+    await strategy.rank("help me with math homework", 3)
+    
+    strategy.remove_agent("mathematician")
+    
+    assert "mathematician" not in strategy.rank_cached("help me with math homework", 3)
+
+
+@pytest.fixture
+async def crowded(monkeypatch):
+    """Agents in an embedding space where every text scores above the threshold."""
+    async def get_embeddings(texts, **kwargs):
+        # A shared component gives unrelated texts a cosine of about 0.8
+        return np.stack([embed(text) + 1.0 for text in texts])
+    
+    monkeypatch.setattr(llm_service, "get_embeddings", get_embeddings)
+    strategy = CapabilityMatchStrategy(threshold=0.7, margin=0.05)
+    await strategy.add_agent("coder", "Writes code", ["code_review"])
+    await strategy.add_agent("mathematician", "Solves math", ["algebra"])
+    return strategy
+
+
+async def test_select_ignores_a_close_semantic_lead(crowded):
+    assert await crowded.select("what is the weather like today") is None
+
+
+async def test_select_takes_a_clear_semantic_lead(crowded):
+    assert await crowded.select("help me with math homework") == "mathematician"
+
+
+async def test_select_takes_a_named_capability(crowded):
+    crowded.margin = 1.0
+    
+    assert await crowded.select("please do a code review") == "coder"
@@ -0,0 +1,115 @@
+"""Tests for host agent turns driven through the ADK runner."""
+
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+from backend.models import Agent as AgentModel, Message
+from backend.services.agent.context_builder import FOLDED_KEY, SUMMARY_KEY
+from backend.services.agent.host_agent import HostAgent
+from backend.services.llm_service import llm_service
+from backend.utils.config import config
+
+
+class ScriptedLlm(BaseLlm):
+    """Model answering every request with the same text, keeping the requests."""
+    
+    reply: str = "Hello from the host agent"
+    requests: list = []
+    
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.requests.append(llm_request)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=self.reply)]))
+
+
+@pytest.fixture
+def host(db):
+    host = HostAgent()
+    host.adk_agent.model = ScriptedLlm(model="scripted", requests=[])
+    return host
+
+
+def request_texts(llm_request):
+    return [part.text for content in llm_request.contents for part in content.parts if part.text]
+
+
+async def run_turn(host, text, conversation_id="conversation-1"):
+    message = Message(id="message", conversation_id=conversation_id, role="user", content=text)
+    return [chunk async for chunk in host.process_message(message)]
+
+
+async def test_turn_reaches_the_model(host):
+    chunks = await run_turn(host, "What can you do?")
+    
+    assert chunks == ["Hello from the host agent"]
+    
+    [llm_request] = host.adk_agent.model.requests
+    assert request_texts(llm_request) == ["What can you do?"]
+    assert host.agent_config.get("instruction", "") in llm_request.config.system_instruction
+
+
+async def test_history_is_replayed_on_the_next_turn(host):
+    await run_turn(host, "first question")
+    await run_turn(host, "second question")
+    
+    llm_request = host.adk_agent.model.requests[-1]
+    assert request_texts(llm_request) == [
+        "first question", "Hello from the host agent", "second question"
+    ]
+
+
+async def test_long_history_is_folded_into_a_summary_before_the_turn(host, monkeypatch):
+    summarized = []
+    
+    async def summarize(summary, contents):
+        summarized.append(len(contents))
+        return "The user asked many questions."
+    
+    monkeypatch.setattr(host.context_builder, "_summarize", summarize)
+    monkeypatch.setattr(host.context_builder, "max_tokens", 60)
+    
+    for i in range(6):
+        await run_turn(host, f"question number {i} " + "padding " * 10)
+    
+    # The model saw the summary followed by the recent turns within budget
+    llm_request = host.adk_agent.model.requests[-1]
+    texts = request_texts(llm_request)
+    assert summarized
+    assert texts[0] == "Summary of the earlier conversation:\nThe user asked many questions."
+    assert texts[-1].startswith("question number 5")
+    
+    # The summary is stored with the session
+    session = host.session_service.get_session(
+        app_name=config.app_name, user_id="user", session_id="conversation-1"
+    )
+    assert session.state[SUMMARY_KEY] == "The user asked many questions."
+    assert session.state[FOLDED_KEY] > 0
+
+
+async def test_large_roster_is_shortlisted_in_the_prompt(host, monkeypatch):
+    monkeypatch.setattr(host, "shortlist_size", 1)
+    
+    async def no_embeddings(texts, **kwargs):
+        raise RuntimeError("embeddings unavailable")
+    
+    monkeypatch.setattr(llm_service, "get_embeddings", no_embeddings)
+    for name, capability in [("coder", "code_review"), ("writer", "proofreading")]:
+        await host.register_remote_agent(AgentModel(
+            name=name,
+            description=f"The {name} agent",
+            url=f"http://{name}",
+            is_remote=True,
+            capabilities_list=[capability]
+        ))
+    
+    await run_turn(host, "Can you do a proofreading pass?")
+    
+    [llm_request] = host.adk_agent.model.requests
+    instruction = llm_request.config.system_instruction
+    assert "Agents most relevant to this message" in instruction
+    assert '"name": "writer"' in instruction
+    assert '"name": "coder"' not in instruction
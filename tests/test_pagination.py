@@ -0,0 +1,90 @@
+"""Tests for keyset pagination of the list routes."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.models import Session as SessionModel
+from backend.routes.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, paginate
+from backend.utils.database import get_async_session_factory
+
+
+@pytest.fixture
+def sessions(db):
+    """Seven sessions, three of which share a creation timestamp."""
+    created_at = datetime(2025, 1, 1)
+    offsets = [0, 1, 1, 1, 2, 3, 4]
+    rows = [
+        SessionModel(id=f"session-{i}", name=f"Session {i}", created_at=created_at + timedelta(seconds=offset))
+        for i, offset in enumerate(offsets)
+    ]
+    with Session(db, expire_on_commit=False) as session:
+        session.add_all(rows)
+        session.commit()
+    return [row.id for row in sorted(rows, key=lambda row: (row.created_at, row.id))]
+
+
+async def fetch_all_pages(limit):
+    """Walk every page of the sessions query, returning the IDs in page order."""
+    ids, cursor, pages = [], None, 0
+    async with get_async_session_factory()() as db:
+        while True:
+            rows, cursor = await paginate(db, select(SessionModel), SessionModel, limit, cursor)
+            ids.extend(row.id for row in rows)
+            pages += 1
+            if cursor is None:
+                return ids, pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 100])
+async def test_pages_cover_every_row_once_in_order(sessions, limit):
+    ids, pages = await fetch_all_pages(limit)
+    
+    assert ids == sessions
+    assert pages == max(1, -(-len(sessions) // limit))
+
+
+async def test_cursor_breaks_timestamp_ties_by_id(sessions):
+    async with get_async_session_factory()() as db:
+        rows, cursor = await paginate(db, select(SessionModel), SessionModel, 2)
+        assert [row.id for row in rows] == sessions[:2]
+        
+        # The cursor points between rows sharing a timestamp
+        created_at, row_id = decode_cursor(cursor)
+        assert (created_at, row_id) == (rows[-1].created_at, rows[-1].id)
+        
+        rows, _ = await paginate(db, select(SessionModel), SessionModel, 2, cursor)
+        assert [row.id for row in rows] == sessions[2:4]
+
+
+async def test_empty_result_has_no_cursor(db):
+    async with get_async_session_factory()() as db_session:
+        rows, cursor = await paginate(db_session, select(SessionModel), SessionModel, 10)
+    
+    assert rows == []
+    assert cursor is None
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 1, 12, 30, 15, 123456)
+    
+    assert decode_cursor(encode_cursor(created_at, "abc|def")) == (created_at, "abc|def")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "bm8gc2VwYXJhdG9y", "Zm9vfGJhcg=="])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+    
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/sessions/", "/conversations/", "/agents/"])
+@pytest.mark.parametrize("limit", [0, -1, MAX_PAGE_SIZE + 1])
+async def test_list_routes_reject_out_of_range_limits(api, path, limit):
+    response = await api.get(path, params={"limit": limit})
+    
+    assert response.status_code == 422
@@ -0,0 +1,51 @@
+"""Tests for the explicit loading of model relationships."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, selectinload
+
+from backend.models import Conversation as ConversationModel, Session as SessionModel
+from backend.routes.schemas import _skip_unloaded
+
+
+@pytest.fixture
+def session_with_conversation(db):
+    """A session with one conversation."""
+    with Session(db) as session:
+        session.add(SessionModel(id="session-1", name="Session"))
+        session.add(ConversationModel(id="conversation-1", name="Conversation", session_id="session-1"))
+        session.commit()
+
+
+def test_unloaded_collection_raises(db, session_with_conversation):
+    with Session(db) as session:
+        row = session.execute(select(SessionModel)).scalars().one()
+        
+        with pytest.raises(InvalidRequestError):
+            row.conversations
+
+
+def test_selectinload_loads_collection(db, session_with_conversation):
+    with Session(db) as session:
+        row = session.execute(
+            select(SessionModel).options(selectinload(SessionModel.conversations))
+        ).scalars().one()
+        
+        assert [conversation.id for conversation in row.conversations] == ["conversation-1"]
+        assert [conversation.id for conversation in _skip_unloaded(row).conversations] == ["conversation-1"]
+
+
+def test_response_reads_unloaded_collection_as_none(db, session_with_conversation):
+    with Session(db) as session:
+        row = session.execute(select(SessionModel)).scalars().one()
+        view = _skip_unloaded(row)
+        
+        assert view.conversations is None
+        assert view.name == "Session"
+        
+        # Loaded rows are passed through unchanged
+        conversation = session.execute(
+            select(ConversationModel).options(selectinload(ConversationModel.messages))
+        ).scalars().one()
+        assert _skip_unloaded(conversation) is conversation
@@ -0,0 +1,85 @@
+"""Tests for streaming tasks from remote agents."""
+
+import json
+
+import httpx
+import pytest
+
+from backend.models import TaskState
+from backend.services.agent.circuit_breaker import CircuitState
+from backend.services.agent.remote_agent_connection import RemoteAgentConnection
+
+
+def stream_response(*lines, status_code=200, content_type="application/x-ndjson"):
+    """A streaming task response made of the given lines."""
+    return httpx.Response(
+        status_code,
+        headers={"content-type": content_type},
+        content="".join(f"{line}\n" for line in lines).encode()
+    )
+
+
+def status_line(state, final=False):
+    return json.dumps({"result": {"status": {"state": state}, "final": final}})
+
+
+@pytest.fixture
+def agent():
+    return RemoteAgentConnection("remote", "A remote agent", "http://remote")
+
+
+def open_for_trial(agent):
+    """Put the circuit breaker in the state where its next request is a half-open trial."""
+    agent.circuit_breaker.state = CircuitState.OPEN
+    agent.circuit_breaker._opened_at = -agent.circuit_breaker.reset_timeout
+
+
+async def collect(agent, task_id="task-1"):
+    return [update async for update in agent.send_task_streaming({"id": task_id})]
+
+
+async def test_streams_updates_until_final(agent, serve_http):
+    serve_http(lambda request: stream_response(status_line("working"), status_line("completed", final=True)))
+    
+    updates = await collect(agent)
+    
+    assert [update["state"] for update in updates] == [TaskState.WORKING, TaskState.COMPLETED]
+    assert agent.pending_tasks == set()
+
+
+@pytest.mark.parametrize("content_type, lines", [
+    ("application/x-ndjson", [status_line("working"), "{not json"]),
+    ("application/x-ndjson", [status_line("working"), "[1, 2]"]),
+    ("text/event-stream", ["data: {broken", ""]),
+])
+async def test_malformed_payload_fails_the_task_and_the_trial(agent, serve_http, content_type, lines):
+    serve_http(lambda request: stream_response(*lines, content_type=content_type))
+    open_for_trial(agent)
+    
+    updates = await collect(agent)
+    
+    assert updates[-1]["state"] == TaskState.FAILED
+    assert updates[-1]["final"] is True
+    assert agent.circuit_breaker.state == CircuitState.OPEN
+    assert agent.circuit_breaker._trial_in_flight is False
+    assert agent.pending_tasks == set()
+
+
+async def test_client_error_does_not_count_against_the_breaker(agent, serve_http):
+    serve_http(lambda request: httpx.Response(400, json={"error": "bad request"}))
+    open_for_trial(agent)
+    
+    updates = await collect(agent)
+    
+    assert updates[-1]["state"] == TaskState.FAILED
+    assert agent.circuit_breaker.state == CircuitState.CLOSED
+    assert agent.circuit_breaker.failures == 0
+
+
+async def test_server_error_counts_against_the_breaker(agent, serve_http):
+    serve_http(lambda request: httpx.Response(503))
+    
+    updates = await collect(agent)
+    
+    assert updates[-1]["state"] == TaskState.FAILED
+    assert agent.circuit_breaker.failures == 1
@@ -0,0 +1,145 @@
+"""Tests for the database-backed ADK session service."""
+
+import time
+
+import pytest
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.genai import types
+from sqlalchemy import event as sqlalchemy_event
+
+from backend.services.agent.session_service import SqlSessionService
+
+APP = "deepdevflow"
+USER = "user"
+
+
+def make_event(text, state_delta=None, timestamp=None):
+    return Event(
+        author="user",
+        invocation_id="invocation",
+        content=types.Content(role="user", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta or {}),
+        timestamp=timestamp or time.time()
+    )
+
+
+def get(service, session_id="session-1"):
+    return service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+
+
+def texts(session):
+    return [event.content.parts[0].text for event in session.events]
+
+
+@pytest.fixture
+def workers(db):
+    """Two workers sharing the database, with a conversation started on the first."""
+    first, second = SqlSessionService(), SqlSessionService()
+    first.create_session(app_name=APP, user_id=USER, session_id="session-1", state={"turns": 0})
+    return first, second
+
+
+@pytest.fixture
+def statements(db):
+    """Statements executed against the database."""
+    executed = []
+    listener = lambda conn, cursor, statement, *args: executed.append(statement)
+    sqlalchemy_event.listen(db, "before_cursor_execute", listener)
+    yield executed
+    sqlalchemy_event.remove(db, "before_cursor_execute", listener)
+
+
+def test_cache_hit_checks_only_the_update_time(workers, statements):
+    first, _ = workers
+    get(first)
+    statements.clear()
+    
+    session = get(first)
+    
+    assert session.state == {"turns": 0}
+    assert len(statements) == 1
+    assert "last_update_time" in statements[0] and "agent_session_events" not in statements[0]
+
+
+def test_worker_reloads_turns_appended_by_another_worker(workers):
+    first, second = workers
+    first.append_event(get(first), make_event("first turn", {"turns": 1}))
+    
+    second.append_event(get(second), make_event("second turn", {"turns": 2}))
+    
+    session = get(first)
+    assert texts(session) == ["first turn", "second turn"]
+    assert session.state == {"turns": 2}
+
+
+def test_concurrent_turns_are_merged_not_overwritten(workers):
+    first, second = workers
+    
+    # Both workers hold the same version of the session
+    first_copy, second_copy = get(first), get(second)
+    now = time.time()
+    first.append_event(first_copy, make_event("from first", {"first": True}, now))
+    second.append_event(second_copy, make_event("from second", {"second": True}, now + 1))
+    
+    for worker in workers:
+        session = get(worker)
+        assert texts(session) == ["from first", "from second"]
+        assert session.state == {"turns": 0, "first": True, "second": True}
+
+
+def test_temp_state_is_not_persisted(workers):
+    first, second = workers
+    
+    first.append_event(get(first), make_event("turn", {"temp:scratch": 1, "kept": 1}))
+    
+    assert get(second).state == {"turns": 0, "kept": 1}
+
+
+def test_deleted_session_is_not_served_from_another_cache(workers):
+    first, second = workers
+    get(second)
+    
+    first.delete_session(app_name=APP, user_id=USER, session_id="session-1")
+    
+    assert get(second) is None
+
+
+async def test_writes_are_queued_and_served_from_memory(workers, statements):
+    first, second = workers
+    
+    first.append_event(get(first), make_event("queued turn", {"turns": 1}))
+    statements.clear()
+    
+    # Queued writes are not checked against the database, which is behind
+    assert texts(get(first)) == ["queued turn"]
+    assert statements == []
+    
+    await first.close()
+    assert texts(get(second)) == ["queued turn"]
+
+
+@pytest.mark.parametrize("second_lands_first", [True, False])
+async def test_merged_session_is_reloaded_after_queued_writes(workers, second_lands_first):
+    first, second = workers
+    first_copy, second_copy = get(first), get(second)
+    now = time.time()
+    
+    async def write_second():
+        second.append_event(second_copy, make_event("from second", {"second": True}, now))
+        await second.close()
+    
+    async def write_first():
+        first.append_event(first_copy, make_event("from first", {"first": True}, now + 1))
+        first.append_event(first_copy, make_event("first again", {"first": 2}, now + 2))
+        await first.close()
+    
+    # Whichever write lands last, both workers notice the other's turns
+    writes = [write_second, write_first] if second_lands_first else [write_first, write_second]
+    for write in writes:
+        await write()
+    
+    for worker in workers:
+        session = get(worker)
+        assert texts(session) == ["from second", "from first", "first again"]
+        assert session.state == {"turns": 0, "second": True, "first": 2}
@@ -0,0 +1,102 @@
+"""Tests for the shared remote task poller."""
+
+import asyncio
+
+import pytest
+
+from backend.models import Task, TaskState
+from backend.services.agent.task_poller import TaskPoller
+
+
+class FakeAgent:
+    """Remote agent answering status requests with a scripted result."""
+    
+    def __init__(self, name="remote"):
+        self.name = name
+        self.pending_tasks = set()
+        self.result = {}
+        self.requests = 0
+    
+    async def get_task_statuses(self, task_ids):
+        self.requests += 1
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def make_task(task_id, state, message=None):
+    return Task(
+        id=task_id,
+        agent_id="remote",
+        message_id="message",
+        session_id="session",
+        state=state,
+        metadata_json={"message": message} if message else {}
+    )
+
+
+@pytest.fixture
+async def poller():
+    poller = TaskPoller(min_interval=10, max_interval=50, backoff=2, max_age=3600)
+    yield poller
+    await poller.stop()
+
+
+async def poll(poller, agent, task_id="task-1"):
+    tracked = poller._tasks[task_id]
+    await poller._poll_agent(agent, [tracked])
+    return tracked.interval
+
+
+@pytest.mark.parametrize("result", [{}, RuntimeError("status endpoint down")])
+async def test_failed_polls_back_off(poller, result):
+    agent = FakeAgent()
+    agent.result = result
+    poller.track(agent, "task-1", TaskState.WORKING)
+    
+    intervals = [await poll(poller, agent) for _ in range(4)]
+    
+    assert intervals == [20, 40, 50, 50]
+
+
+async def test_unchanged_polls_back_off_and_changes_reset(poller):
+    agent = FakeAgent()
+    poller.track(agent, "task-1", TaskState.WORKING)
+    
+    agent.result = {"task-1": make_task("task-1", TaskState.WORKING)}
+    assert [await poll(poller, agent) for _ in range(2)] == [20, 40]
+    
+    agent.result = {"task-1": make_task("task-1", TaskState.WORKING, message="halfway")}
+    assert await poll(poller, agent) == 10
+
+
+async def test_terminal_state_finishes_the_task(poller):
+    agent = FakeAgent()
+    poller.track(agent, "task-1", TaskState.WORKING)
+    
+    agent.result = {"task-1": make_task("task-1", TaskState.COMPLETED)}
+    await poll(poller, agent)
+    
+    assert poller.get_state("task-1") is None
+
+
+async def test_untrack_agent_drops_its_tasks_and_releases_watchers(poller):
+    agent, other = FakeAgent("remote"), FakeAgent("other")
+    poller.track(agent, "task-1", TaskState.WORKING)
+    poller.track(other, "task-2", TaskState.WORKING)
+    tracked = poller._tasks["task-1"]
+    pending_update = asyncio.ensure_future(poller.watch("task-1").__anext__())
+    await asyncio.sleep(0)
+    
+    poller.untrack_agent(agent)
+    
+    assert (await pending_update)["final"] is True
+    assert poller.get_state("task-1") is None
+    assert poller.get_state("task-2") == TaskState.WORKING
+    assert agent.pending_tasks == set()
+    
+    # A poll already in flight does not reschedule the dropped task
+    scheduled = len(poller._heap)
+    await poller._poll_agent(agent, [tracked])
+    assert "task-1" not in poller._tasks
+    assert len(poller._heap) == scheduled